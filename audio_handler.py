@@ -1,145 +1,457 @@
-import pyaudio
 import wave
 import tempfile
-import whisper
 import os
 import threading
+import time
+import numpy as np
+from audio_utils import frames_to_float32, resample, WHISPER_SAMPLE_RATE
+from streaming_transcriber import StreamingTranscriber
+from vad import create_vad, Endpointer
+from inference_worker import InferenceWorker
+from model_manager import ModelManager
+from startup_profiler import profiler
+from tracing import tracer
+from inference_backends import decoding_options
+from device_probe import DeviceProbe
+from capture_stream import CaptureStream
+from longform import LongFormTranscriber
 
 class AudioHandler:
     def __init__(self, config_manager, message_queue):
         self.config_manager = config_manager
         self.message_queue = message_queue
-        self.p = pyaudio.PyAudio()
-        self.model = None
-        self.stream = None
+        self._p = None
+        self._probe = None
+        self.model_manager = ModelManager(config_manager, message_queue)
+        self.capture = None
+        self.capture_lock = threading.Lock()
         self.is_recording = False
+        self.model_lock = threading.Lock()
+        self.longform = LongFormTranscriber(config_manager, self.model_manager, self.model_lock, message_queue)
+        self.worker = InferenceWorker(
+            message_queue,
+            config_manager.get('inference_queue_size'),
+            max_batch=config_manager.get('batch_max_size'),
+            max_wait_ms=config_manager.get('batch_max_wait_ms')
+        )
+        # Running from the start means a failed first load can't leave later jobs stranded in the queue
+        self.worker.start()
     
-    def get_audio_devices(self):
+    @property
+    def p(self):
+        """PyAudio instance, initialized on first use"""
+        if self._p is None:
+            with profiler.measure("PyAudio init"):
+                import pyaudio
+                self._p = pyaudio.PyAudio()
+        return self._p
+    
+    @property
+    def probe(self):
+        """Device capability cache, created with the PyAudio instance"""
+        if self._probe is None:
+            self._probe = DeviceProbe(self.p, self.config_manager.get('device_cache_file'))
+        return self._probe
+    
+    @property
+    def model(self):
+        """The currently active inference backend"""
+        return self.model_manager.active_model
+    
+    def get_audio_devices(self, refresh=False):
         """Get list of available audio input devices"""
-        devices = []
-        for i in range(self.p.get_device_count()):
-            info = self.p.get_device_info_by_index(i)
-            if info['maxInputChannels'] > 0:
-                devices.append(f"{i}: {info['name']}")
-        return devices
+        return [f"{device['index']}: {device['name']}" for device in self.probe.devices(refresh)]
+    
+    def select_device(self, mic_index=None):
+        """Resolve the input device and store its negotiated capture format in the config"""
+        device = self.probe.find(self.config_manager.get('mic_name') if mic_index is None else None,
+                                 self.config_manager.get('mic_index') if mic_index is None else mic_index)
+        if device is None:
+            raise OSError("No audio input device available")
+        if self.config_manager.get('negotiate_capture_format'):
+            rate, channels = self.probe.negotiate(device, self.config_manager.get('rate'))
+            self.config_manager.update({'rate': rate, 'channels': channels})
+        return device['index']
     
     def load_model_async(self):
         """Load Whisper model asynchronously"""
         def load_model():
             try:
                 self.message_queue.put(("status", "Loading Whisper model..."))
-                self.model = whisper.load_model(self.config_manager.get('model_name'))
+                self.model_manager.activate(self.config_manager.get('model_name'))
                 self.message_queue.put(("status", "Model loaded successfully"))
                 self.message_queue.put(("enable_controls", True))
             except Exception as e:
                 self.message_queue.put(("error", f"Failed to load model: {e}"))
+            finally:
+                self.message_queue.put(("component_ready", "model"))
         
         threading.Thread(target=load_model, daemon=True).start()
     
+    def switch_model_async(self, model_name):
+        """Load (or reuse a cached) model and make it active without interrupting running jobs"""
+        if (self.config_manager.get('backend'), model_name) == self.model_manager.active_key:
+            return
+        
+        def switch():
+            try:
+                self.model_manager.activate(model_name)
+                self.message_queue.put(("enable_controls", True))
+            except Exception as e:
+                self.message_queue.put(("error", f"Failed to switch model: {e}"))
+        
+        threading.Thread(target=switch, daemon=True).start()
+    
+    def open_capture(self, mic_index=None):
+        """Return the running capture stream for the selected device, reopening it if the device or format changed"""
+        with self.capture_lock:
+            device_index = self.select_device(mic_index)
+            config = self.config_manager.snapshot
+            if self.capture and self.capture.matches(device_index, config.rate, config.channels, config.chunk):
+                return self.capture
+            if self.capture:
+                self.capture.close()
+            self.capture = CaptureStream(self.p, device_index, config.rate, config.channels, config.chunk,
+                                         config.capture_buffer_s, self.message_queue, config.capture_stall_ms)
+            try:
+                self.capture.start()
+            except Exception:
+                self.capture = None
+                raise
+            return self.capture
+    
+    def start_capture_async(self):
+        """Open the persistent capture stream in the background so the first recording starts instantly"""
+        def start():
+            try:
+                self.open_capture()
+            except Exception as e:
+                self.message_queue.put(("error", f"Failed to open microphone: {e}"))
+        
+        threading.Thread(target=start, daemon=True).start()
+    
+    def close_capture(self):
+        """Release the input device"""
+        with self.capture_lock:
+            if self.capture:
+                self.capture.close()
+                self.capture = None
+    
     def start_recording(self, mic_index=None):
         """Start recording audio"""
         if not self.model:
             self.message_queue.put(("error", "Model not loaded yet!"))
             return False
         
+        # Anchor the pre-roll to the keypress, not to when the record thread gets scheduled
+        capture = self.capture
+        start_position = capture.position if capture else None
+        
         def record():
+            trace_id = tracer.new_trace()
             try:
-                frames = self.record_audio(mic_index)
+                capture = self.open_capture(mic_index)
+                if self.config_manager.get('streaming_mode'):
+                    streamer = StreamingTranscriber(self.model, self.config_manager, self.message_queue, self.model_lock)
+                    streamer.start()
+                    try:
+                        with tracer.span(trace_id, 'capture'):
+                            self.record_audio(capture, on_chunk=streamer.add_frames, start_position=start_position)
+                    except Exception:
+                        streamer.stop()
+                        raise
+                    # If the job is dropped or cancelled, finish() never runs, so stop the background decoding instead
+                    if self.worker.submit(self.process_streaming, streamer, trace_id, on_cancel=streamer.stop) is None:
+                        streamer.stop()
+                    return
+                
+                with tracer.span(trace_id, 'capture'):
+                    frames = self.record_audio(capture, start_position=start_position)
                 if frames:
-                    self.process_audio(frames)
+                    self.worker.submit(self.process_audio, frames, trace_id, batch_target=self.process_audio_batch)
             except Exception as e:
                 self.message_queue.put(("error", f"Recording error: {e}"))
+            finally:
+                if not self.config_manager.get('persistent_capture'):
+                    self.close_capture()
         
         threading.Thread(target=record, daemon=True).start()
         return True
     
-    def record_audio(self, mic_index=None):
-        """Record audio frames"""
+    def record_audio(self, capture=None, on_chunk=None, start_position=None):
+        """Record from the ring buffer, starting `preroll_ms` before `start_position`; returns one int16 array"""
+        if capture is None:
+            capture = self.open_capture()
+        config = self.config_manager.snapshot
+        chunk = config.chunk
+        vad = create_vad(self.config_manager, self.message_queue)
+        endpointer = Endpointer(vad, self.config_manager) if vad else None
+        
+        if start_position is None or start_position > capture.position:
+            start_position = capture.position
+        cursor = max(capture.oldest, start_position - int(config.rate * config.preroll_ms / 1000))
+        limit = cursor + int(config.rate * config.max_recording_s) if config.max_recording_s else None
         frames = []
-        try:
-            if mic_index is None:
-                mic_index = self.config_manager.get('mic_index')
-            
-            self.stream = self.p.open(
-                format=pyaudio.paInt16,
-                channels=self.config_manager.get('channels'),
-                rate=self.config_manager.get('rate'),
-                input=True,
-                input_device_index=mic_index,
-                frames_per_buffer=self.config_manager.get('chunk')
-            )
-            
-            self.message_queue.put(("log", "Recording... (press F2 to stop)"))
-            self.is_recording = True
-            
-            while self.is_recording:
-                try:
-                    data = self.stream.read(self.config_manager.get('chunk'))
-                    frames.append(data)
-                except OSError as e:
-                    self.message_queue.put(("error", f"Audio error: {e}"))
-                    break
-                    
-        finally:
-            if self.stream:
-                self.stream.stop_stream()
-                self.stream.close()
-                self.stream = None
+        dropped = 0
+        glitches_before = capture.stats()
+        
+        self.message_queue.put(("log", "Recording... (press F2 to stop)"))
+        self.is_recording = True
+        
+        while self.is_recording:
+            if capture.wait(cursor + chunk) < cursor + chunk:
+                if not capture.running:
+                    self.is_recording = False
+                continue
+            # Copy out of the ring, then make sure the writer did not lap this chunk while we were behind
+            data = capture.view(cursor, cursor + chunk).copy()
+            if cursor < capture.oldest:
+                dropped += capture.oldest - cursor
+                cursor = capture.oldest
+                continue
+            cursor += chunk
+            frames.append(data)
+            if on_chunk:
+                on_chunk(data)
+            if endpointer and endpointer.process(data):
+                self.message_queue.put(("log", "Silence detected, recording stopped"))
+                self.message_queue.put(("recording_stopped", None))
+                self.is_recording = False
+            elif limit and cursor >= limit:
+                self.message_queue.put(("log", f"Maximum recording length ({config.max_recording_s} s) reached, recording stopped"))
+                self.message_queue.put(("recording_stopped", None))
+                self.is_recording = False
         
-        return frames
+        if dropped:
+            self.message_queue.put(("error", f"Recording fell behind the capture buffer, {dropped / config.rate:.1f} s of audio lost"))
+        glitches = {key: count - glitches_before[key] for key, count in capture.stats().items()}
+        if any(glitches.values()):
+            self.message_queue.put(("log", "Audio glitches during recording: " + ", ".join(
+                f"{count} {key}" for key, count in glitches.items() if count)))
+        
+        if endpointer:
+            if not endpointer.speech_detected:
+                self.message_queue.put(("log", "No speech detected"))
+            frames = endpointer.trim(frames)
+        return [np.concatenate(frames)] if frames else []
     
     def stop_recording(self):
         """Stop recording audio"""
         self.is_recording = False
     
+    def cancel_pending(self):
+        """Cancel queued and in-flight transcriptions"""
+        cancelled = self.worker.cancel_pending()
+        self.message_queue.put(("log", f"Cancelled {cancelled} pending transcription(s)"))
+        return cancelled
+    
     def save_temp_audio(self, frames):
         """Save audio frames to temporary WAV file"""
         with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tf:
             with wave.open(tf.name, 'wb') as wf:
                 wf.setnchannels(self.config_manager.get('channels'))
-                wf.setsampwidth(self.p.get_sample_size(pyaudio.paInt16))
+                wf.setsampwidth(2)  # int16 PCM
                 wf.setframerate(self.config_manager.get('rate'))
                 wf.writeframes(b''.join(frames))
             return tf.name
     
-    def process_audio(self, frames):
-        """Process recorded audio frames and transcribe"""
+    def frames_to_audio(self, frames, trace_id=None):
+        """Convert recorded frames into a 16 kHz float32 array for Whisper"""
+        with tracer.span(trace_id, 'buffer_assembly'):
+            audio = frames_to_float32(frames, self.config_manager.get('channels'))
+        with tracer.span(trace_id, 'resample'):
+            return resample(audio, self.config_manager.get('rate'), WHISPER_SAMPLE_RATE)
+    
+    def transcribe_frames(self, frames, trace_id=None):
+        """Transcribe frames in memory, falling back to a temp WAV; None if the language gate rejects the clip"""
+        audio = None
+        if self.config_manager.get('in_memory_audio'):
+            try:
+                audio = self.frames_to_audio(frames, trace_id)
+            except Exception as e:
+                self.message_queue.put(("log", f"In-memory conversion failed, using temp file: {e}"))
+        
+        if audio is not None:
+            return self.transcribe_audio(audio, trace_id)
+        
+        model = self.model
+        self.model_manager.touch()
         temp_path = None
         try:
             temp_path = self.save_temp_audio(frames)
+            with self.model_lock, tracer.span(trace_id, 'inference', path='temp_file'):
+                return model.transcribe(temp_path, language=None, **decoding_options(self.config_manager.get('decoding_preset')))
+        finally:
+            if temp_path and os.path.exists(temp_path):
+                os.unlink(temp_path)
+    
+    def transcribe_audio(self, audio, trace_id=None):
+        """Transcribe 16 kHz float32 audio; None if the language gate rejects the clip"""
+        self.model_manager.touch()
+        if self.longform.applies(audio):
+            start = time.perf_counter()
+            with tracer.span(trace_id, 'inference', model=self.model_manager.active_name, longform=True):
+                result = self.longform.transcribe(audio)
+            tracer.record_rtf(trace_id, len(audio) / WHISPER_SAMPLE_RATE, time.perf_counter() - start)
+            return result
+        
+        model = self.model
+        with self.model_lock:
+            start = time.perf_counter()
+            with tracer.span(trace_id, 'language_detection'):
+                language, probability = model.detect_language(audio, self.config_manager.get('allowed_languages'))
+            if probability < self.config_manager.get('language_min_probability'):
+                return None
+            with tracer.span(trace_id, 'inference', model=self.model_manager.active_name, backend=model.name):
+                result = model.transcribe(audio, language=language, **decoding_options(self.config_manager.get('decoding_preset')))
+            tracer.record_rtf(trace_id, len(audio) / WHISPER_SAMPLE_RATE, time.perf_counter() - start)
+            return result
+    
+    def transcribe_batch(self, audios, trace_ids):
+        """Transcribe several 16 kHz clips with one batched model call; None entries were rejected by the language gate"""
+        results = [None] * len(audios)
+        batch = []
+        for index, audio in enumerate(audios):
+            if self.longform.applies(audio):
+                results[index] = self.transcribe_audio(audio, trace_ids[index])
+            else:
+                batch.append(index)
+        if not batch:
+            return results
+        
+        model = self.model
+        self.model_manager.touch()
+        allowed = self.config_manager.get('allowed_languages')
+        min_probability = self.config_manager.get('language_min_probability')
+        with self.model_lock:
+            languages = {}
+            for index in batch:
+                with tracer.span(trace_ids[index], 'language_detection'):
+                    language, probability = model.detect_language(audios[index], allowed)
+                if probability >= min_probability:
+                    languages[index] = language
             
+            accepted = list(languages)
+            start = time.perf_counter()
+            batch_results = model.transcribe_batch(
+                [audios[index] for index in accepted],
+                [languages[index] for index in accepted],
+                **decoding_options(self.config_manager.get('decoding_preset'))
+            ) if accepted else []
+            elapsed = time.perf_counter() - start
+        
+        for index, result in zip(accepted, batch_results):
+            results[index] = result
+            trace_id = trace_ids[index]
+            if trace_id is not None:
+                tracer.record(trace_id, 'inference', elapsed, {'model': self.model_manager.active_name, 'batch_size': len(accepted)})
+                tracer.record_rtf(trace_id, len(audios[index]) / WHISPER_SAMPLE_RATE, elapsed / len(accepted))
+        return results
+    
+    def process_audio(self, frames, trace_id=None, job=None):
+        """Process recorded audio frames and transcribe"""
+        try:
             self.message_queue.put(("log", "Transcribing..."))
-            result = self.model.transcribe(temp_path, task='transcribe', language=None)
+            result = self.transcribe_frames(frames, trace_id)
+            self.publish_result(result, trace_id, job)
+        except Exception as e:
+            self.message_queue.put(("error", f"Processing error: {e}"))
+    
+    def process_audio_batch(self, jobs):
+        """Transcribe recordings that queued up behind each other as one batch"""
+        if not self.config_manager.get('in_memory_audio'):
+            for job in jobs:
+                self.process_audio(*job.args, job=job)
+            return
+        
+        batch, audios = [], []
+        for job in jobs:
+            frames, trace_id = job.args
+            try:
+                audios.append(self.frames_to_audio(frames, trace_id))
+                batch.append(job)
+            except Exception:
+                # On its own the job falls back to a temp file
+                self.process_audio(*job.args, job=job)
+        if not batch:
+            return
+        
+        trace_ids = [job.args[1] for job in batch]
+        try:
+            self.message_queue.put(("log", f"Transcribing {len(batch)} queued recordings together..."))
+            results = self.transcribe_batch(audios, trace_ids)
+        except Exception as e:
+            # Don't lose the whole batch to one bad clip: retry each recording on its own
+            self.message_queue.put(("log", f"Batched transcription failed, transcribing one by one: {e}"))
+            for job in batch:
+                self.process_audio(*job.args, job=job)
+            return
+        
+        for job, result, trace_id in zip(batch, results, trace_ids):
+            try:
+                self.publish_result(result, trace_id, job)
+            except Exception as e:
+                self.message_queue.put(("error", f"Processing error: {e}"))
+    
+    def publish_result(self, result, trace_id=None, job=None):
+        """Hand a finished transcription to the GUI unless it was cancelled or rejected"""
+        if job and job.cancelled:
+            return
+        if result is None:
+            self.report_unsupported_language()
+            return
+        
+        raw_text, lang = self.process_transcription(result)
+        if raw_text is None:
+            return
+        
+        self.message_queue.put(("audio_processed", (raw_text, lang, trace_id)))
+    
+    def process_streaming(self, streamer, trace_id=None, job=None):
+        """Finish a streaming transcription by decoding only the unstable tail"""
+        try:
+            self.message_queue.put(("log", "Finalizing transcription..."))
+            with tracer.span(trace_id, 'inference', streaming=True):
+                result = streamer.finish()
+            if not result["text"] or (job and job.cancelled):
+                return
+            # Same gate transcribe_audio applies before decoding
+            if result["language_probability"] < self.config_manager.get('language_min_probability'):
+                self.report_unsupported_language()
+                return
             
             raw_text, lang = self.process_transcription(result)
             if raw_text is None:
                 return
             
-            self.message_queue.put(("audio_processed", (raw_text, lang)))
-                
+            self.message_queue.put(("audio_processed", (raw_text, lang, trace_id)))
+        
         except Exception as e:
             self.message_queue.put(("error", f"Processing error: {e}"))
-        finally:
-            if temp_path and os.path.exists(temp_path):
-                os.unlink(temp_path)
     
     def process_transcription(self, result):
         """Process Whisper transcription result"""
         detected_lang = result.get("language", "")
         raw_text = result["text"].strip()
         
-        if detected_lang not in ['en', 'zh']:
-            self.message_queue.put(("log", "Unsupported language detected. Please speak English or Chinese."))
+        if detected_lang not in self.config_manager.get('allowed_languages'):
+            self.report_unsupported_language()
             return None, None
         
         return raw_text, detected_lang
     
+    def report_unsupported_language(self):
+        """Tell the user which languages are accepted"""
+        allowed = ", ".join(self.config_manager.get('allowed_languages'))
+        self.message_queue.put(("log", f"Unsupported language detected. Please speak one of: {allowed}"))
+    
     def cleanup(self):
         """Cleanup resources"""
         try:
-            if self.stream:
-                self.stream.stop_stream()
-                self.stream.close()
-            self.p.terminate()
+            self.worker.stop()
+            self.close_capture()
+            self.model_manager.close()
+            if self._p:
+                self._p.terminate()
         except:
             pass
\ No newline at end of file
@@ -0,0 +1,69 @@
+import wave
+import numpy as np
+from functools import lru_cache
+from math import ceil, gcd
+
+WHISPER_SAMPLE_RATE = 16000
+
+def frames_to_float32(frames, channels=1):
+    """Convert raw int16 PCM frames into a mono float32 array in [-1, 1)"""
+    pcm = np.frombuffer(frames[0] if len(frames) == 1 else b''.join(frames), dtype=np.int16)
+    audio = pcm.astype(np.float32) / 32768.0
+    if channels > 1:
+        audio = audio[:len(audio) - len(audio) % channels].reshape(-1, channels).mean(axis=1)
+    return audio
+
+def load_wav(path):
+    """Read a 16-bit PCM WAV file as (frames, rate, channels)"""
+    with wave.open(str(path), 'rb') as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError(f"{path} is not 16-bit PCM")
+        return [wf.readframes(wf.getnframes())], wf.getframerate(), wf.getnchannels()
+
+def synthetic_clip(seconds, rate=48000):
+    """Voice-like test signal: a harmonic tone with syllable-rate amplitude modulation"""
+    t = np.arange(int(seconds * rate)) / rate
+    pitch = 140 + 20 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None)
+    noise = np.random.default_rng(0).normal(0, 0.01, len(t))
+    signal = 0.3 * voice * envelope + noise
+    pcm = (np.clip(signal, -1, 1) * 32767).astype(np.int16)
+    return [pcm.tobytes()], rate, 1
+
+@lru_cache(maxsize=8)
+def _lowpass_taps(down, taps_per_phase=16, cutoff=None):
+    """Windowed-sinc anti-aliasing filter for decimating by `down`, cutting off at `cutoff` of Nyquist (1/down by default)"""
+    half = taps_per_phase * down // 2
+    n = np.arange(-half, half + 1, dtype=np.float64)
+    cutoff = cutoff or 1.0 / down
+    taps = np.sinc(cutoff * n) * cutoff * np.hamming(len(n))
+    return (taps / taps.sum()).astype(np.float32)
+
+def resample(audio, orig_rate, target_rate=WHISPER_SAMPLE_RATE):
+    """Resample a float32 signal with a vectorized FIR filter"""
+    if orig_rate == target_rate or len(audio) == 0:
+        return audio.astype(np.float32, copy=False)
+    
+    g = gcd(int(orig_rate), int(target_rate))
+    up, down = target_rate // g, orig_rate // g
+    
+    if up == 1:
+        # Integer decimation (e.g. 48 kHz -> 16 kHz): only the kept outputs are computed
+        taps = _lowpass_taps(down)
+        half = len(taps) // 2
+        padded = np.pad(audio, (half, half))
+        windows = np.lib.stride_tricks.sliding_window_view(padded, len(taps))[::down]
+        return (windows @ taps).astype(np.float32)
+    
+    if orig_rate > target_rate:
+        # Cut at the target Nyquist; rounding the ratio would leave e.g. 22050 -> 16000 unfiltered
+        taps = _lowpass_taps(ceil(orig_rate / target_rate), cutoff=target_rate / orig_rate)
+        audio = np.convolve(audio, taps, mode='same')
+    
+    duration = len(audio) / orig_rate
+    target_len = int(round(duration * target_rate))
+    src_times = np.arange(len(audio)) / orig_rate
+    dst_times = np.arange(target_len) / target_rate
+    return np.interp(dst_times, src_times, audio).astype(np.float32)
\ No newline at end of file
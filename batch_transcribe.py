@@ -0,0 +1,177 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from config_manager import ConfigManager
+from audio_handler import AudioHandler
+from translation_manager import TranslationManager
+from audio_utils import load_wav
+
+class ConsoleSink:
+    """Message queue stand-in that prints component messages to stderr"""
+    
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+    
+    def put(self, message):
+        msg_type, content = message
+        if msg_type == "error" or (self.verbose and msg_type in ("log", "status")):
+            print(f"[{os.getpid()}] {msg_type}: {content}", file=sys.stderr)
+
+_worker = {}
+
+def init_worker(model_name, backend, translate, threads, verbose):
+    """Load one model per worker process"""
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+    
+    sink = ConsoleSink(verbose)
+    config_manager = ConfigManager()
+    # The pool already runs one model per process, so no child servers or long-form worker pools
+    config_manager.update({'inference_process': False, 'longform_mode': False})
+    if backend:
+        config_manager.set('backend', backend)
+    audio_handler = AudioHandler(config_manager, sink)
+    audio_handler.model_manager.activate(model_name or config_manager.get('model_name'))
+    
+    _worker['config'] = config_manager
+    _worker['audio'] = audio_handler
+    _worker['translation'] = TranslationManager(config_manager, sink)
+    _worker['translate'] = translate
+
+def prepare_item(item):
+    """Load and resample one input (a WAV path, or raw PCM with its format); returns (record, audio)"""
+    name, pcm = item
+    record = {'source': name, 'text': None, 'language': None, 'translation': None, 'timings': {}}
+    try:
+        frames, rate, channels = load_wav(name) if pcm is None else pcm
+        _worker['config'].update({'rate': rate, 'channels': channels})
+        
+        start = time.perf_counter()
+        audio = _worker['audio'].frames_to_audio(frames)
+        record['timings']['resample_ms'] = (time.perf_counter() - start) * 1000
+        record['duration_s'] = len(audio) / 16000
+        return record, audio
+    except Exception as e:
+        record['error'] = str(e)
+        return record, None
+
+def finish_item(record, result):
+    """Correct (and optionally translate) a transcription into its JSON-ready record"""
+    audio_handler = _worker['audio']
+    translation_manager = _worker['translation']
+    timings = record['timings']
+    try:
+        if result is None:
+            record['error'] = "unsupported language"
+            return record
+        
+        raw_text, lang = audio_handler.process_transcription(result)
+        if raw_text is None:
+            record['error'] = "unsupported language"
+            return record
+        
+        start = time.perf_counter()
+        text, _ = translation_manager.correct_transcription(raw_text, lang)
+        timings['correction_ms'] = (time.perf_counter() - start) * 1000
+        record['text'] = text
+        record['language'] = lang
+        
+        if _worker['translate'] and lang == 'en':
+            start = time.perf_counter()
+            record['translation'] = translation_manager.translate_to_chinese(text)
+            timings['translation_ms'] = (time.perf_counter() - start) * 1000
+    except Exception as e:
+        record['error'] = str(e)
+    return record
+
+def transcribe_items(items):
+    """Transcribe a group of inputs with one batched model call and return their records in order"""
+    prepared = [prepare_item(item) for item in items]
+    loaded = [index for index, (_, audio) in enumerate(prepared) if audio is not None]
+    results = {}
+    if loaded:
+        start = time.perf_counter()
+        try:
+            audios = [prepared[index][1] for index in loaded]
+            if len(audios) == 1:
+                # A lone clip gets the full transcribe path, with segments beyond the first 30 s window
+                batch = [_worker['audio'].transcribe_audio(audios[0])]
+            else:
+                batch = _worker['audio'].transcribe_batch(audios, [None] * len(audios))
+            results = dict(zip(loaded, batch))
+        except Exception as e:
+            for index in loaded:
+                prepared[index][0]['error'] = str(e)
+            loaded = []
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for index in loaded:
+            prepared[index][0]['timings']['inference_ms'] = elapsed_ms / len(loaded)
+            prepared[index][0]['batch_size'] = len(loaded)
+    
+    return [finish_item(record, results[index]) if index in results else record
+            for index, (record, _) in enumerate(prepared)]
+
+def batched(items, size):
+    """Group an iterable into lists of up to `size` items"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def collect_inputs(args):
+    """Yield (name, pcm) items; files are read inside the workers, stdin PCM is passed along"""
+    for source in args.inputs:
+        if source == '-':
+            yield '<stdin>', ([sys.stdin.buffer.read()], args.rate, args.channels)
+            continue
+        path = Path(source)
+        files = sorted(path.rglob('*.wav')) if path.is_dir() else [path]
+        for f in files:
+            yield str(f), None
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcribe WAV files or raw PCM without the GUI, one model per worker process")
+    parser.add_argument('inputs', nargs='+', help="WAV files, directories of WAV files, or '-' for raw int16 PCM on stdin")
+    parser.add_argument('--model', help="Whisper model size (defaults to model_name from config)")
+    parser.add_argument('--backend', help="inference backend (defaults to backend from config)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="number of worker processes")
+    parser.add_argument('--batch-size', type=int, default=1, help="inputs each worker decodes together in one batched call")
+    parser.add_argument('--rate', type=int, default=16000, help="sample rate of raw PCM on stdin")
+    parser.add_argument('--channels', type=int, default=1, help="channel count of raw PCM on stdin")
+    parser.add_argument('--translate', action='store_true', help="translate English results to Chinese")
+    parser.add_argument('--output', help="write JSONL here instead of stdout")
+    parser.add_argument('--verbose', action='store_true', help="print component log messages to stderr")
+    args = parser.parse_args()
+    
+    if args.translate:
+        from translation_bootstrap import TranslationBootstrap
+        TranslationBootstrap(ConfigManager(), ConsoleSink(args.verbose)).run()
+    
+    workers = max(1, args.workers)
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker,
+            initargs=(args.model, args.backend, args.translate, threads, args.verbose)
+        ) as pool:
+            for records in pool.map(transcribe_items, batched(collect_inputs(args), max(1, args.batch_size))):
+                for record in records:
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,181 @@
+import argparse
+import json
+import platform
+import queue
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+from config_manager import ConfigManager
+from audio_handler import AudioHandler
+from translation_manager import TranslationManager
+from roblox_interface import RobloxInterface
+from chat_backends import FakeChatBackend
+from audio_utils import load_wav, synthetic_clip
+
+STAGES = ['resample', 'inference', 'correction', 'triggers', 'translation', 'send', 'total']
+
+def build_clips(args):
+    clips = []
+    for path in args.corpus or []:
+        path = Path(path)
+        files = sorted(path.glob('*.wav')) if path.is_dir() else [path]
+        clips.extend((f.name, *load_wav(f)) for f in files)
+    for seconds in args.synthetic or []:
+        clips.append((f"synthetic-{seconds:g}s", *synthetic_clip(seconds)))
+    return clips
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, if the platform exposes it"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+        except Exception:
+            return None
+
+def percentiles(samples):
+    values = np.array(samples) * 1000
+    return {
+        'count': len(values),
+        'mean_ms': float(values.mean()),
+        'p50_ms': float(np.percentile(values, 50)),
+        'p95_ms': float(np.percentile(values, 95)),
+        'p99_ms': float(np.percentile(values, 99))
+    }
+
+def run_model(model_name, backend, clips, repeat, translate):
+    """Benchmark one model size; runs in its own process so peak RSS is per model"""
+    config_manager = ConfigManager()
+    config_manager.update({'backend': backend, 'inference_process': False, 'longform_mode': False, 'chat_backend': 'fake', 'chat_rate_limit': 0, 'chat_key_delay_ms': 0, 'chat_min_key_delay_ms': 0})
+    sink = queue.Queue()
+    
+    audio_handler = AudioHandler(config_manager, sink)
+    translation_manager = TranslationManager(config_manager, sink)
+    roblox_interface = RobloxInterface(config_manager, sink, FakeChatBackend())
+    
+    load_start = time.perf_counter()
+    audio_handler.model_manager.activate(model_name)
+    load_seconds = time.perf_counter() - load_start
+    
+    min_probability = config_manager.get('language_min_probability')
+    timings = {stage: [] for stage in STAGES}
+    audio_seconds = 0.0
+    run_start = time.perf_counter()
+    
+    for _ in range(repeat):
+        for name, frames, rate, channels in clips:
+            config_manager.update({
+                'rate': rate,
+                'channels': channels,
+                'language_min_probability': 0.0 if name.startswith('synthetic') else min_probability
+            })
+            
+            t0 = time.perf_counter()
+            audio = audio_handler.frames_to_audio(frames)
+            t1 = time.perf_counter()
+            result = audio_handler.transcribe_audio(audio)
+            t2 = time.perf_counter()
+            timings['resample'].append(t1 - t0)
+            timings['inference'].append(t2 - t1)
+            audio_seconds += len(audio) / 16000
+            
+            text, lang = ("", None) if result is None else (result["text"].strip(), result.get("language"))
+            if lang is None:
+                timings['total'].append(t2 - t0)
+                continue
+            
+            corrected, _ = translation_manager.correct_transcription(text, lang)
+            t3 = time.perf_counter()
+            translation_manager.check_trigger_phrases(corrected, lang)
+            t4 = time.perf_counter()
+            if translate and lang == 'en':
+                corrected = translation_manager.translate_to_chinese(corrected)
+            t5 = time.perf_counter()
+            roblox_interface.deliver(corrected or name)
+            t6 = time.perf_counter()
+            
+            timings['correction'].append(t3 - t2)
+            timings['triggers'].append(t4 - t3)
+            if translate:
+                timings['translation'].append(t5 - t4)
+            timings['send'].append(t6 - t5)
+            timings['total'].append(t6 - t0)
+    
+    elapsed = time.perf_counter() - run_start
+    utterances = len(clips) * repeat
+    return {
+        'model': model_name,
+        'backend': backend,
+        'load_seconds': load_seconds,
+        'utterances': utterances,
+        'audio_seconds': audio_seconds,
+        'throughput_ups': utterances / elapsed if elapsed else 0.0,
+        'real_time_factor': sum(timings['inference']) / audio_seconds if audio_seconds else None,
+        'peak_rss_mb': peak_rss_mb(),
+        'stages': {stage: percentiles(values) for stage, values in timings.items() if values}
+    }
+
+def compare(results, baseline_path, tolerance):
+    """Return stage regressions of p95 latency beyond `tolerance` against a previous run"""
+    baseline = json.loads(Path(baseline_path).read_text())['results']
+    regressions = []
+    for model, result in results.items():
+        for stage, stats in result['stages'].items():
+            previous = baseline.get(model, {}).get('stages', {}).get(stage)
+            if previous and stats['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+                regressions.append(f"{model}/{stage}: p95 {previous['p95_ms']:.1f} -> {stats['p95_ms']:.1f} ms")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the voice transcription pipeline without a microphone, Tk or Roblox")
+    parser.add_argument('--models', nargs='+', default=['tiny', 'base'], help="Whisper model sizes to benchmark")
+    parser.add_argument('--backends', nargs='+', default=['whisper'], help="inference backends to benchmark")
+    parser.add_argument('--corpus', nargs='+', help="WAV files or directories of WAV files")
+    parser.add_argument('--synthetic', nargs='+', type=float, help="lengths in seconds of synthetic clips")
+    parser.add_argument('--repeat', type=int, default=3, help="passes over the clip set")
+    parser.add_argument('--translate', action='store_true', help="include the en->zh translation stage")
+    parser.add_argument('--output', default='benchmark_results.json', help="where to write the JSON report")
+    parser.add_argument('--baseline', help="previous JSON report to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="allowed p95 slowdown against the baseline")
+    args = parser.parse_args()
+    
+    if not args.corpus and not args.synthetic:
+        args.synthetic = [2, 5, 10]
+    clips = build_clips(args)
+    
+    results = {}
+    for backend in args.backends:
+        for model_name in args.models:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                result = pool.submit(run_model, model_name, backend, clips, args.repeat, args.translate).result()
+            key = model_name if backend == 'whisper' else f"{backend}/{model_name}"
+            results[key] = result
+            total = result['stages']['total']
+            print(f"{key}: p50 {total['p50_ms']:.0f} ms, p95 {total['p95_ms']:.0f} ms, "
+                  f"{result['throughput_ups']:.2f} utt/s, peak RSS {result['peak_rss_mb'] or 0:.0f} MB")
+    
+    report = {
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'clips': [name for name, *_ in clips],
+        'results': results
+    }
+    Path(args.output).write_text(json.dumps(report, indent=4))
+    print(f"Results written to {args.output}")
+    
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
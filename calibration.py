@@ -0,0 +1,151 @@
+import argparse
+import itertools
+import os
+import sys
+import time
+from pathlib import Path
+import numpy as np
+from config_manager import ConfigManager
+from audio_handler import AudioHandler
+from batch_transcribe import ConsoleSink
+from audio_utils import load_wav, synthetic_clip
+from command_grammar import edit_distance, tokenize
+from inference_backends import DECODING_PRESETS, set_thread_count
+
+MODEL_ORDER = ['tiny', 'base', 'small', 'medium', 'large']
+
+# Relative accuracy used when there are no reference transcripts to score against
+PRESET_ACCURACY_BONUS = {'greedy': 0.0, 'greedy_fallback': 0.25, 'beam': 0.5, 'beam_fallback': 0.75}
+
+def load_clips(clip_dir):
+    """WAV clips with optional `<name>.txt` reference transcripts, or the built-in synthetic set"""
+    clips = []
+    if clip_dir and Path(clip_dir).is_dir():
+        for path in sorted(Path(clip_dir).glob('*.wav')):
+            reference = path.with_suffix('.txt')
+            text = reference.read_text(encoding='utf-8').strip() if reference.exists() else None
+            clips.append((path.name, *load_wav(path), text))
+    if not clips:
+        clips = [(f"synthetic-{s}s", *synthetic_clip(s), None) for s in (2, 4, 6)]
+    return clips
+
+def word_error_rate(reference, hypothesis):
+    ref = tuple(tokenize(reference))
+    if not ref:
+        return 0.0
+    return edit_distance(ref, tuple(tokenize(hypothesis))) / len(ref)
+
+def measure(audio_handler, config_manager, clips, repeat, min_probability):
+    """Latencies (seconds) and mean WER (None without references) for the current settings"""
+    latencies = []
+    errors = []
+    for _ in range(repeat):
+        for name, frames, rate, channels, reference in clips:
+            config_manager.update({
+                'rate': rate,
+                'channels': channels,
+                'language_min_probability': 0.0 if reference is None else min_probability
+            })
+            start = time.perf_counter()
+            result = audio_handler.transcribe_frames(frames)
+            latencies.append(time.perf_counter() - start)
+            if reference is not None:
+                errors.append(word_error_rate(reference, result["text"] if result else ""))
+    return latencies, (float(np.mean(errors)) if errors else None)
+
+def accuracy_score(model_name, preset, wer):
+    """Higher is better: 1 - WER when measured, otherwise a size/preset prior"""
+    if wer is not None:
+        return 1.0 - wer
+    rank = MODEL_ORDER.index(model_name) if model_name in MODEL_ORDER else 0
+    return rank + PRESET_ACCURACY_BONUS[preset]
+
+def calibrate(args):
+    config_manager = ConfigManager()
+    # Thread counts are swept in this process, so inference has to run here too
+    config_manager.update({'inference_process': False, 'longform_mode': False})
+    audio_handler = AudioHandler(config_manager, ConsoleSink())
+    clips = load_clips(args.clips)
+    budget_ms = args.budget_ms or config_manager.get('latency_budget_ms')
+    min_probability = config_manager.get('language_min_probability')
+    has_references = all(clip[-1] is not None for clip in clips)
+    
+    print(f"Calibrating {len(clips)} clips against a p95 budget of {budget_ms:.0f} ms "
+          f"({'reference WER' if has_references else 'no references, ranking by model size'})")
+    
+    measurements = []
+    for model_name in args.models:
+        try:
+            audio_handler.model_manager.activate(model_name)
+        except Exception as e:
+            print(f"  {model_name}: failed to load ({e})")
+            continue
+        for preset, threads in itertools.product(args.presets, args.threads):
+            set_thread_count(threads)
+            config_manager.update({'decoding_preset': preset, 'torch_threads': threads})
+            latencies, wer = measure(audio_handler, config_manager, clips, args.repeat, min_probability)
+            p95 = float(np.percentile(latencies, 95)) * 1000
+            entry = {
+                'model_name': model_name,
+                'decoding_preset': preset,
+                'torch_threads': threads,
+                'p95_ms': p95,
+                'wer': wer,
+                'score': accuracy_score(model_name, preset, wer)
+            }
+            measurements.append(entry)
+            wer_text = f"WER {wer:.2f}" if wer is not None else "WER n/a"
+            print(f"  {model_name:<8} {preset:<16} threads={threads:<3} p95 {p95:8.0f} ms  {wer_text}")
+    
+    if not measurements:
+        return None
+    within_budget = [m for m in measurements if m['p95_ms'] <= budget_ms]
+    if within_budget:
+        return max(within_budget, key=lambda m: (m['score'], -m['p95_ms'])), measurements
+    print("No setup meets the latency budget; choosing the fastest one")
+    return min(measurements, key=lambda m: m['p95_ms']), measurements
+
+def main():
+    cpu_count = os.cpu_count() or 1
+    default_threads = sorted({1, max(1, cpu_count // 2), cpu_count})
+    
+    parser = argparse.ArgumentParser(description="Pick the most accurate model and decoding setup that meets the latency budget on this machine")
+    parser.add_argument('--models', nargs='+', default=['tiny', 'base', 'small'], help="model sizes to try")
+    parser.add_argument('--presets', nargs='+', default=list(DECODING_PRESETS), choices=list(DECODING_PRESETS), help="decoding presets to try")
+    parser.add_argument('--threads', nargs='+', type=int, default=default_threads, help="torch thread counts to try")
+    parser.add_argument('--budget-ms', type=float, help="p95 latency budget per clip (defaults to latency_budget_ms from config)")
+    parser.add_argument('--clips', help="directory of WAV clips with matching .txt reference transcripts")
+    parser.add_argument('--repeat', type=int, default=2, help="passes over the clip set per setup")
+    parser.add_argument('--dry-run', action='store_true', help="report the choice without saving it")
+    args = parser.parse_args()
+    
+    outcome = calibrate(args)
+    if outcome is None:
+        print("Calibration failed: no model could be loaded")
+        return 1
+    
+    best, measurements = outcome
+    print(f"Selected: model={best['model_name']} preset={best['decoding_preset']} "
+          f"threads={best['torch_threads']} (p95 {best['p95_ms']:.0f} ms)")
+    if args.dry_run:
+        return 0
+    
+    config_manager = ConfigManager()
+    config_manager.update({
+        'model_name': best['model_name'],
+        'decoding_preset': best['decoding_preset'],
+        'torch_threads': best['torch_threads'],
+        'calibration_profile': {
+            'selected': best,
+            'budget_ms': args.budget_ms or config_manager.get('latency_budget_ms'),
+            'measured_at': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'measurements': measurements
+        }
+    })
+    if not config_manager.save_config():
+        return 1
+    print(f"Saved profile to {ConfigManager.CONFIG_FILE}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
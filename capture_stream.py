@@ -0,0 +1,153 @@
+import threading
+import time
+import numpy as np
+
+# PortAudio callback flags and return codes, so the module imports without PyAudio
+PA_INPUT_UNDERFLOW = 0x1
+PA_INPUT_OVERFLOW = 0x2
+PA_CONTINUE = 0
+PA_COMPLETE = 1
+
+class CaptureStream:
+    """Keeps one callback-mode input stream open and writes it into a preallocated ring buffer.
+    
+    Positions are absolute frame counts since the stream was opened, so a recording can
+    start a little before the hotkey was pressed and copy chunks out of the ring.
+    PortAudio calls `_callback` on its own thread, which only copies into the ring and
+    bumps the position, so capture keeps up even while inference holds the GIL for long
+    stretches. A monitor thread reopens the device if it stalls, keeping the ring intact.
+    """
+    
+    def __init__(self, p, device_index, rate, channels, chunk, buffer_seconds, message_queue, stall_ms=1000):
+        self.p = p
+        self.device_index = device_index
+        self.rate = rate
+        self.channels = channels
+        self.chunk = chunk
+        self.message_queue = message_queue
+        self.stall_seconds = stall_ms / 1000.0
+        self.capacity = max(2, int(rate * buffer_seconds) // chunk) * chunk
+        self.ring = np.zeros((self.capacity, channels), dtype=np.int16)
+        self.position = 0
+        self.overflows = 0
+        self.underflows = 0
+        self.restarts = 0
+        self.running = False
+        self.stream = None
+        self.monitor = None
+        self.stop_event = threading.Event()
+        self.stream_lock = threading.Lock()
+    
+    def matches(self, device_index, rate, channels, chunk):
+        return self.running and (self.device_index, self.rate, self.channels, self.chunk) == (device_index, rate, channels, chunk)
+    
+    def start(self):
+        """Open the device and start filling the ring buffer"""
+        self.stream = self._open()
+        self.running = True
+        self.monitor = threading.Thread(target=self._monitor, daemon=True)
+        self.monitor.start()
+    
+    def _open(self):
+        import pyaudio
+        stream = self.p.open(
+            format=pyaudio.paInt16,
+            channels=self.channels,
+            rate=self.rate,
+            input=True,
+            input_device_index=self.device_index,
+            frames_per_buffer=self.chunk,
+            stream_callback=self._callback
+        )
+        stream.start_stream()
+        return stream
+    
+    def _callback(self, in_data, frame_count, time_info, status):
+        """Runs on the PortAudio thread: copy into the ring and publish the new position, nothing else"""
+        if status & PA_INPUT_OVERFLOW:
+            self.overflows += 1
+        if status & PA_INPUT_UNDERFLOW:
+            self.underflows += 1
+        
+        samples = np.frombuffer(in_data, dtype=np.int16).reshape(-1, self.channels)
+        offset = self.position % self.capacity
+        head = min(len(samples), self.capacity - offset)
+        self.ring[offset:offset + head] = samples[:head]
+        if head < len(samples):
+            self.ring[:len(samples) - head] = samples[head:]
+        # Publish only after the copy so readers never see frames that are not written yet
+        self.position += len(samples)
+        return None, PA_CONTINUE if self.running else PA_COMPLETE
+    
+    def _monitor(self):
+        """Reopen the device when the callback stops delivering audio"""
+        last_position, last_progress = self.position, time.monotonic()
+        while not self.stop_event.wait(self.stall_seconds / 4):
+            if self.position != last_position:
+                last_position, last_progress = self.position, time.monotonic()
+                continue
+            if time.monotonic() - last_progress < self.stall_seconds:
+                continue
+            try:
+                with self.stream_lock:
+                    self._close_stream()
+                stream = self._open()
+                with self.stream_lock:
+                    if self.stop_event.is_set():
+                        # close() finished while the device was reopening; don't leave it open behind it
+                        self._shutdown(stream)
+                        break
+                    self.stream = stream
+                self.restarts += 1
+                self.message_queue.put(("log", "Audio input stalled, reopened the device"))
+            except OSError as e:
+                self.message_queue.put(("error", f"Audio error: {e}"))
+            last_progress = time.monotonic()
+    
+    @property
+    def oldest(self):
+        """Oldest position still in the ring, leaving one chunk for the writer"""
+        return max(0, self.position - self.capacity + self.chunk)
+    
+    def wait(self, position, timeout=0.5):
+        """Poll until `position` has been captured, the stream stops or `timeout` passes; returns the current position"""
+        deadline = time.monotonic() + timeout
+        interval = self.chunk / self.rate / 4
+        while self.position < position and self.running and time.monotonic() < deadline:
+            time.sleep(interval)
+        return self.position
+    
+    def view(self, start, end):
+        """Frames [start, end) as a view into the ring, or a copy when the range wraps around"""
+        offset = start % self.capacity
+        length = end - start
+        if offset + length <= self.capacity:
+            return self.ring[offset:offset + length]
+        return np.concatenate((self.ring[offset:], self.ring[:offset + length - self.capacity]))
+    
+    def stats(self):
+        """Glitch counters since the stream was opened"""
+        return {'overflows': self.overflows, 'underflows': self.underflows, 'restarts': self.restarts}
+    
+    @staticmethod
+    def _shutdown(stream):
+        try:
+            stream.stop_stream()
+            stream.close()
+        except OSError:
+            pass
+    
+    def _close_stream(self):
+        """Close the current stream; callers hold `stream_lock`"""
+        if self.stream:
+            self._shutdown(self.stream)
+            self.stream = None
+    
+    def close(self):
+        """Stop the monitor and release the device"""
+        self.running = False
+        self.stop_event.set()
+        if self.monitor:
+            self.monitor.join(timeout=1.0)
+        with self.stream_lock:
+            self._close_stream()
\ No newline at end of file
@@ -0,0 +1,89 @@
+import threading
+import time
+
+class ChatBackend:
+    """Window, keyboard and clipboard operations used by the chat send pipeline"""
+    
+    def focused_window_title(self):
+        raise NotImplementedError
+    
+    def copy_to_clipboard(self, text):
+        raise NotImplementedError
+    
+    def open_chat(self):
+        raise NotImplementedError
+    
+    def paste(self):
+        raise NotImplementedError
+    
+    def submit(self):
+        raise NotImplementedError
+
+class WindowsChatBackend(ChatBackend):
+    """Drives the real game window through win32gui, keyboard and pyperclip"""
+    
+    def focused_window_title(self):
+        import win32gui
+        return win32gui.GetWindowText(win32gui.GetForegroundWindow())
+    
+    def copy_to_clipboard(self, text):
+        import pyperclip
+        pyperclip.copy(text)
+    
+    def open_chat(self):
+        import keyboard
+        keyboard.press_and_release('/')
+    
+    def paste(self):
+        import keyboard
+        keyboard.press_and_release('ctrl+v')
+    
+    def submit(self):
+        import keyboard
+        keyboard.press_and_release('enter')
+
+class FakeChatBackend(ChatBackend):
+    """In-memory backend for tests and benchmarks; records what would have been sent"""
+    
+    def __init__(self, window_title="Roblox", key_latency=0.0):
+        self.window_title = window_title
+        self.key_latency = key_latency
+        self.clipboard = ""
+        self.chat_open = False
+        self.draft = ""
+        self.sent = []
+        self.lock = threading.Lock()
+    
+    def focused_window_title(self):
+        return self.window_title
+    
+    def copy_to_clipboard(self, text):
+        self.clipboard = text
+    
+    def _press(self):
+        if self.key_latency:
+            time.sleep(self.key_latency)
+    
+    def open_chat(self):
+        self._press()
+        self.chat_open = True
+        self.draft = ""
+    
+    def paste(self):
+        self._press()
+        if self.chat_open:
+            self.draft += self.clipboard
+    
+    def submit(self):
+        self._press()
+        if self.chat_open:
+            with self.lock:
+                self.sent.append((time.time(), self.draft))
+        self.chat_open = False
+        self.draft = ""
+
+def create_chat_backend(name):
+    """Build the backend selected by the `chat_backend` config key"""
+    if name == 'fake':
+        return FakeChatBackend()
+    return WindowsChatBackend()
\ No newline at end of file
@@ -0,0 +1,112 @@
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+VoiceCommand = namedtuple('VoiceCommand', ['phrase', 'action', 'argument', 'anywhere'], defaults=[None, False])
+CommandMatch = namedtuple('CommandMatch', ['command', 'start', 'end', 'cost'])
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+def tokenize(text):
+    """Lowercase word tokens, ignoring punctuation"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+@lru_cache(maxsize=4096)
+def edit_distance(a, b):
+    """Levenshtein distance between two tokens"""
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+class CommandGrammar:
+    """Voice commands compiled into a token trie, matched in one pass over the utterance.
+    
+    Tokens that aren't in the command vocabulary are mapped to vocabulary words within
+    a small edit distance, so typical Whisper mis-hearings ("translations", "stat") still match,
+    as long as the whole phrase costs at most `max_cost` edits. Commands only match the whole
+    utterance unless they are marked `anywhere`; those must appear verbatim inside a longer
+    utterance, so ordinary chat like "I will start translating for you" is left alone.
+    """
+    
+    END = object()
+    CACHE_SIZE = 1024
+    
+    def __init__(self, commands, fuzzy_ratio=0.25, min_fuzzy_length=4, max_cost=1):
+        self.fuzzy_ratio = fuzzy_ratio
+        self.min_fuzzy_length = min_fuzzy_length
+        self.max_cost = max_cost
+        self.trie = {}
+        self.vocabulary = set()
+        self.candidate_cache = {}
+        for command in commands:
+            self.add(command)
+    
+    def add(self, command):
+        """Insert a command phrase into the trie"""
+        tokens = tokenize(command.phrase)
+        if not tokens:
+            return
+        node = self.trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+            self.vocabulary.add(token)
+        node[self.END] = command
+        self.candidate_cache.clear()
+    
+    def _candidates(self, token):
+        """Vocabulary words this token may stand for, with their edit cost"""
+        if token in self.vocabulary:
+            return ((token, 0),)
+        if not self.fuzzy_ratio or len(token) < self.min_fuzzy_length:
+            return ()
+        if token not in self.candidate_cache:
+            if len(self.candidate_cache) >= self.CACHE_SIZE:
+                # Chat keeps producing new words; start over rather than grow without bound
+                self.candidate_cache.clear()
+            limit = max(1, int(len(token) * self.fuzzy_ratio))
+            matches = []
+            for word in self.vocabulary:
+                if abs(len(word) - len(token)) > limit:
+                    continue
+                distance = edit_distance(token, word)
+                if distance <= limit:
+                    matches.append((word, distance))
+            self.candidate_cache[token] = tuple(matches)
+        return self.candidate_cache[token]
+    
+    def match(self, text):
+        """Return the longest, closest CommandMatch found in `text`, or None"""
+        tokens = tokenize(text)
+        candidates = [self._candidates(token) for token in tokens]
+        best = None
+        
+        for start in range(len(tokens)):
+            states = [(self.trie, 0)]
+            for index in range(start, len(tokens)):
+                next_states = []
+                for node, cost in states:
+                    for word, distance in candidates[index]:
+                        child = node.get(word)
+                        if child is None:
+                            continue
+                        total = cost + distance
+                        if total > self.max_cost:
+                            continue
+                        next_states.append((child, total))
+                        command = child.get(self.END)
+                        if command is None:
+                            continue
+                        whole = start == 0 and index + 1 == len(tokens)
+                        if not whole and (not command.anywhere or total):
+                            continue
+                        found = CommandMatch(command, start, index + 1, total)
+                        if best is None or (found.end - found.start, -found.cost) > (best.end - best.start, -best.cost):
+                            best = found
+                if not next_states:
+                    break
+                states = next_states
+        return best
\ No newline at end of file
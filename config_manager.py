@@ -1,6 +1,38 @@
 import json
+import os
+import tempfile
+import threading
 from pathlib import Path
 
+class ConfigSnapshot:
+    """Immutable view of the configuration; readers hold a reference instead of taking a lock"""
+    
+    __slots__ = ('_values',)
+    
+    def __init__(self, values):
+        object.__setattr__(self, '_values', dict(values))
+    
+    def __getattr__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            raise AttributeError(key) from None
+    
+    def __setattr__(self, key, value):
+        raise AttributeError("ConfigSnapshot is read-only")
+    
+    def __getitem__(self, key):
+        return self._values[key]
+    
+    def __contains__(self, key):
+        return key in self._values
+    
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+    
+    def to_dict(self):
+        return dict(self._values)
+
 class ConfigManager:
     CONFIG_FILE = "config.json"
     
@@ -15,9 +47,79 @@ class ConfigManager:
             'translation_trigger': 'start translation',
             'stop_translation': 'stop translation',
             'roblox_window_title': 'Roblox',
-            'enable_chinese_autocorrect': False
+            'enable_chinese_autocorrect': False,
+            'in_memory_audio': True,
+            'streaming_mode': False,
+            'stream_step_ms': 1000,
+            'stream_window_s': 20,
+            'stream_stability_s': 1.0,
+            'vad_mode': 'energy',
+            'vad_aggressiveness': 2,
+            'vad_padding_ms': 300,
+            'vad_auto_stop_ms': 0,
+            'inference_queue_size': 4,
+            'model_cache_size': 2,
+            'model_memory_budget_mb': 0,
+            'model_idle_unload_s': 600,
+            'allowed_languages': ['en', 'zh'],
+            'language_min_probability': 0.3,
+            'translation_cache_size': 512,
+            'translation_cache_file': None,
+            'translation_cache_max_persistent': 10000,
+            'translation_pairs': [['en', 'zh']],
+            'translation_package_dir': 'argos_packages',
+            'translation_package_checksums': {},
+            'translation_require_checksum': False,
+            'voice_commands': [],
+            'command_fuzzy_ratio': 0.25,
+            'command_max_edits': 1,
+            'log_max_lines': 1000,
+            'message_poll_ms': 250,
+            'chat_backend': 'windows',
+            'chat_max_length': 200,
+            'chat_rate_limit': 5,
+            'chat_rate_window_s': 10,
+            'chat_key_delay_ms': 100,
+            'chat_min_key_delay_ms': 100,
+            'chat_max_key_delay_ms': 400,
+            'focus_cache_ms': 500,
+            'tracing_enabled': False,
+            'trace_file': 'traces/trace.jsonl',
+            'trace_max_bytes': 5 * 1024 * 1024,
+            'trace_backups': 3,
+            'trace_stats_window': 50,
+            'backend': 'whisper',
+            'decoding_preset': 'greedy',
+            'torch_threads': 0,
+            'latency_budget_ms': 1500,
+            'mic_name': None,
+            'negotiate_capture_format': True,
+            'device_cache_file': 'device_cache.json',
+            'config_watch_interval_s': 1.0,
+            'hotkey_mode': 'toggle',
+            'hotkey_bindings': [],
+            'persistent_capture': True,
+            'capture_buffer_s': 30,
+            'preroll_ms': 300,
+            'max_recording_s': 120,
+            'capture_stall_ms': 1000,
+            'inference_process': True,
+            'inference_retries': 1,
+            'inference_timeout_s': 0,
+            'longform_mode': False,
+            'longform_min_s': 30,
+            'longform_chunk_s': 28,
+            'longform_overlap_s': 1.0,
+            'longform_workers': 0,
+            'batch_max_size': 4,
+            'batch_max_wait_ms': 0
         }
-        self.config = self.load_config()
+        self.write_lock = threading.Lock()
+        self.subscribers = []
+        self.snapshot = ConfigSnapshot(self.load_config())
+        self.file_signature = self._file_signature()
+        self.watcher = None
+        self.stop_event = threading.Event()
     
     def load_config(self):
         """Load configuration from file, falling back to defaults if needed"""
@@ -25,33 +127,117 @@ class ConfigManager:
             if Path(self.CONFIG_FILE).exists():
                 with open(self.CONFIG_FILE, 'r') as f:
                     config = json.load(f)
-                    return {**self.default_config, **config}
+                    return {**self.default_config, **self._typed(config)}
         except Exception as e:
             print(f"Error loading config: {e}")
         return self.default_config.copy()
     
     def save_config(self):
-        """Save current configuration to file"""
+        """Save current configuration atomically via a temp file and rename"""
         try:
-            with open(self.CONFIG_FILE, 'w') as f:
-                json.dump(self.config, f, indent=4)
+            path = Path(self.CONFIG_FILE)
+            fd, temp_path = tempfile.mkstemp(prefix=path.name, suffix=".tmp", dir=path.parent)
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(self.snapshot.to_dict(), f, indent=4)
+                os.replace(temp_path, path)
+            except Exception:
+                os.unlink(temp_path)
+                raise
+            self.file_signature = self._file_signature()
             return True
         except Exception as e:
             print(f"Error saving config: {e}")
             return False
     
+    @property
+    def config(self):
+        """Plain dict copy of the current snapshot"""
+        return self.snapshot.to_dict()
+    
     def get(self, key, default=None):
         """Get a configuration value"""
-        return self.config.get(key, default)
+        return self.snapshot.get(key, default)
     
     def set(self, key, value):
         """Set a configuration value"""
-        self.config[key] = value
+        self.update({key: value})
     
     def update(self, updates):
-        """Update multiple configuration values"""
-        self.config.update(updates)
+        """Update multiple configuration values and notify subscribers of the keys that changed"""
+        with self.write_lock:
+            current = self.snapshot
+            changed = {key for key, value in updates.items() if current.get(key) != value or key not in current}
+            if not changed:
+                return
+            self.snapshot = ConfigSnapshot({**current.to_dict(), **updates})
+            snapshot = self.snapshot
+        self._notify(snapshot, changed)
     
     def get_all(self):
         """Get all configuration values"""
-        return self.config.copy()
\ No newline at end of file
+        return self.snapshot.to_dict()
+    
+    def subscribe(self, keys, callback):
+        """Call `callback(snapshot, changed_keys)` whenever any of `keys` changes; runs on the writing thread"""
+        self.subscribers.append((frozenset(keys), callback))
+    
+    def _notify(self, snapshot, changed):
+        for keys, callback in list(self.subscribers):
+            if keys & changed:
+                try:
+                    callback(snapshot, changed & keys)
+                except Exception as e:
+                    print(f"Config subscriber failed: {e}")
+    
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.CONFIG_FILE)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+    
+    def start_watching(self):
+        """Poll the config file and apply external edits live"""
+        interval = self.get('config_watch_interval_s')
+        if not interval or self.watcher:
+            return
+        self.watcher = threading.Thread(target=self._watch, args=(interval,), daemon=True)
+        self.watcher.start()
+    
+    def _watch(self, interval):
+        while not self.stop_event.wait(interval):
+            signature = self._file_signature()
+            if signature is None or signature == self.file_signature:
+                continue
+            self.file_signature = signature
+            self.reload()
+    
+    def reload(self):
+        """Re-read the config file and apply any changed values"""
+        try:
+            with open(self.CONFIG_FILE, 'r') as f:
+                self.update(self._typed(json.load(f)))
+        except Exception as e:
+            print(f"Error reloading config: {e}")
+    
+    def _typed(self, values):
+        """Drop file values whose type does not match the default, so a typo cannot break a component"""
+        typed = {}
+        for key, value in values.items():
+            default = self.default_config.get(key)
+            # bool is an int subclass, so `true` would otherwise pass for numeric settings
+            numeric = isinstance(default, (int, float)) and not isinstance(default, bool)
+            if numeric and isinstance(value, bool):
+                matches = False
+            else:
+                matches = isinstance(value, type(default)) or (isinstance(default, float) and isinstance(value, int))
+            if default is None or matches:
+                typed[key] = value
+            else:
+                print(f"Ignoring config value {key}={value!r}: expected {type(default).__name__}")
+        return typed
+    
+    def stop_watching(self):
+        """Stop the file watcher"""
+        self.stop_event.set()
\ No newline at end of file
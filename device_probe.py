@@ -0,0 +1,120 @@
+import json
+from pathlib import Path
+from audio_utils import WHISPER_SAMPLE_RATE
+
+class DeviceProbe:
+    """Enumerates input devices once and caches each device's supported capture formats on disk"""
+    
+    CANDIDATE_RATES = (16000, 32000, 48000, 44100, 22050, 24000, 8000)
+    CANDIDATE_CHANNELS = (1, 2)
+    
+    def __init__(self, pyaudio_instance, cache_path=None):
+        self.p = pyaudio_instance
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.device_list = None
+        self.capability_cache = self._load_cache()
+    
+    def _load_cache(self):
+        if self.cache_path and self.cache_path.exists():
+            try:
+                return json.loads(self.cache_path.read_text())
+            except Exception:
+                pass
+        return {}
+    
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        try:
+            self.cache_path.write_text(json.dumps(self.capability_cache, indent=4))
+        except OSError:
+            pass
+    
+    def devices(self, refresh=False):
+        """Input devices as dicts with index, name, host_api, default_rate and max_channels"""
+        if self.device_list is None or refresh:
+            self.device_list = []
+            for i in range(self.p.get_device_count()):
+                info = self.p.get_device_info_by_index(i)
+                if info['maxInputChannels'] > 0:
+                    host_api = self.p.get_host_api_info_by_index(info['hostApi'])['name']
+                    self.device_list.append({
+                        'index': i,
+                        'name': info['name'],
+                        'host_api': host_api,
+                        'default_rate': int(info['defaultSampleRate']),
+                        'max_channels': int(info['maxInputChannels'])
+                    })
+        return self.device_list
+    
+    @staticmethod
+    def device_key(device):
+        """Stable identifier that survives index changes when devices are plugged in"""
+        return f"{device['host_api']}:{device['name']}"
+    
+    def find(self, name=None, index=None):
+        """Match a device by name (exact, then case-insensitive substring), falling back to index"""
+        devices = self.devices()
+        if name:
+            for device in devices:
+                if device['name'] == name:
+                    return device
+            lowered = name.lower()
+            for device in devices:
+                if lowered in device['name'].lower():
+                    return device
+        for device in devices:
+            if device['index'] == index:
+                return device
+        try:
+            default_index = self.p.get_default_input_device_info()['index']
+            return next((d for d in devices if d['index'] == default_index), None)
+        except (IOError, OSError):
+            return devices[0] if devices else None
+    
+    def capabilities(self, device):
+        """Supported {'rates': [...], 'channels': [...]} for a device, probed once and cached"""
+        key = self.device_key(device)
+        if key not in self.capability_cache:
+            rates = [rate for rate in self.CANDIDATE_RATES if self._supported(device, rate, 1)
+                     or (device['max_channels'] >= 2 and self._supported(device, rate, 2))]
+            channels = [ch for ch in self.CANDIDATE_CHANNELS
+                        if ch <= device['max_channels'] and self._supported(device, rates[0] if rates else device['default_rate'], ch)]
+            self.capability_cache[key] = {
+                'rates': rates or [device['default_rate']],
+                'channels': channels or [min(device['max_channels'], 2)]
+            }
+            self._save_cache()
+        return self.capability_cache[key]
+    
+    def _supported(self, device, rate, channels):
+        import pyaudio
+        try:
+            return self.p.is_format_supported(
+                rate,
+                input_device=device['index'],
+                input_channels=channels,
+                input_format=pyaudio.paInt16
+            )
+        except ValueError:
+            return False
+    
+    def negotiate(self, device, preferred_rate):
+        """Pick the capture (rate, channels) that needs the least conversion to 16 kHz mono"""
+        caps = self.capabilities(device)
+        channels = 1 if 1 in caps['channels'] else min(caps['channels'])
+        rates = caps['rates']
+        
+        if WHISPER_SAMPLE_RATE in rates:
+            return WHISPER_SAMPLE_RATE, channels
+        # Integer multiples of 16 kHz decimate directly; smaller ones copy and filter less data
+        multiples = sorted(rate for rate in rates if rate % WHISPER_SAMPLE_RATE == 0)
+        if multiples:
+            return multiples[0], channels
+        # Otherwise the highest rate, which leaves the anti-aliasing filter room above 8 kHz
+        above = [rate for rate in rates if rate > WHISPER_SAMPLE_RATE]
+        if above:
+            return max(above), channels
+        if preferred_rate in rates:
+            return preferred_rate, channels
+        return max(rates), channels
@@ -1,15 +1,60 @@
-import keyboard
+from collections import namedtuple
+
+Binding = namedtuple('Binding', ['modifiers', 'action', 'hold'])
 
 class HotkeyManager:
+    """Global keyboard hook that matches a precompiled binding table and hands actions to the Tk thread"""
+    
+    MODIFIER_ALIASES = {
+        'left ctrl': 'ctrl', 'right ctrl': 'ctrl',
+        'left shift': 'shift', 'right shift': 'shift',
+        'left alt': 'alt', 'right alt': 'alt', 'alt gr': 'alt',
+        'left windows': 'windows', 'right windows': 'windows'
+    }
+    
     def __init__(self, config_manager, message_queue):
         self.config_manager = config_manager
         self.message_queue = message_queue
         self.callbacks = {}
+        self.release_callbacks = {}
         self.is_setup = False
+        self.pressed = set()
+        self.held = {}
+        self.bindings = self.compile_bindings(config_manager.snapshot)
+        config_manager.subscribe(('hotkey', 'hotkey_mode', 'hotkey_bindings'), self._on_config_changed)
+    
+    def _on_config_changed(self, snapshot, changed):
+        """Swap in a freshly compiled table; the hook only ever reads the reference"""
+        self.bindings = self.compile_bindings(snapshot)
+    
+    @classmethod
+    def normalize(cls, key_name):
+        key_name = (key_name or '').strip().lower()
+        return cls.MODIFIER_ALIASES.get(key_name, key_name)
+    
+    @classmethod
+    def compile_bindings(cls, config):
+        """Map each trigger key to the bindings it can fire, e.g. 'ctrl+f3' -> {'f3': [({'ctrl'}, action)]}"""
+        main_action = 'push_to_talk' if config.get('hotkey_mode') == 'hold' else 'recording_toggle'
+        entries = [(config.get('hotkey'), main_action)]
+        entries += [(entry['keys'], entry['action']) for entry in config.get('hotkey_bindings') or []]
+        
+        table = {}
+        for keys, action in entries:
+            parts = [cls.normalize(part) for part in (keys or '').split('+') if part.strip()]
+            if not parts:
+                continue
+            trigger, modifiers = parts[-1], frozenset(parts[:-1])
+            table.setdefault(trigger, []).append(Binding(modifiers, action, action == 'push_to_talk'))
+        # Longer chords first so ctrl+f2 wins over a bare f2 binding
+        for candidates in table.values():
+            candidates.sort(key=lambda binding: -len(binding.modifiers))
+        return table
     
     def setup_hotkeys(self):
         """Setup keyboard hooks for hotkeys"""
         try:
+            import keyboard
             if self.is_setup:
                 keyboard.unhook_all()
             
@@ -20,35 +65,53 @@ class HotkeyManager:
             self.message_queue.put(("error", f"Hotkey setup failed: {e}"))
             return False
     
-    def register_hotkey(self, hotkey_name, callback):
-        """Register a callback for a specific hotkey"""
+    def register_hotkey(self, hotkey_name, callback, on_release=None):
+        """Register a callback for an action, plus an optional release callback for hold bindings"""
         self.callbacks[hotkey_name] = callback
+        if on_release:
+            self.release_callbacks[hotkey_name] = on_release
     
     def unregister_hotkey(self, hotkey_name):
         """Unregister a hotkey callback"""
-        if hotkey_name in self.callbacks:
-            del self.callbacks[hotkey_name]
+        self.callbacks.pop(hotkey_name, None)
+        self.release_callbacks.pop(hotkey_name, None)
     
     def _on_key_event(self, e):
-        """Handle keyboard events"""
+        """Handle keyboard events; runs on the system-wide hook thread, so only match and post"""
+        key = self.normalize(e.name)
         if e.event_type == 'down':
-            if e.name == self.config_manager.get('hotkey'):
-                if 'recording_toggle' in self.callbacks:
-                    self.callbacks['recording_toggle']()
-            
-            for hotkey_name, callback in self.callbacks.items():
-                if hotkey_name != 'recording_toggle':
-                    pass
+            if key in self.pressed:
+                return  # auto-repeat
+            self.pressed.add(key)
+            for binding in self.bindings.get(key, ()):
+                if binding.modifiers <= self.pressed:
+                    if binding.hold:
+                        self.held[key] = binding.action
+                    self.message_queue.put(("hotkey", (binding.action, True)))
+                    break
+        elif e.event_type == 'up':
+            self.pressed.discard(key)
+            action = self.held.pop(key, None)
+            if action:
+                self.message_queue.put(("hotkey", (action, False)))
+    
+    def dispatch(self, event):
+        """Run the callback for a posted ("hotkey", (action, pressed)) message on the Tk thread"""
+        action, pressed = event
+        callback = self.callbacks.get(action) if pressed else self.release_callbacks.get(action)
+        if callback:
+            callback()
     
     def update_hotkey(self, new_hotkey):
         """Update the main hotkey"""
         self.config_manager.set('hotkey', new_hotkey)
-        return self.setup_hotkeys()
+        return True
     
     def cleanup(self):
         """Cleanup keyboard hooks"""
         try:
             if self.is_setup:
+                import keyboard
                 keyboard.unhook_all()
                 self.is_setup = False
         except:
@@ -0,0 +1,204 @@
+import warnings
+from language_gate import detect_allowed_language
+from audio_utils import WHISPER_SAMPLE_RATE
+
+FALLBACK_TEMPERATURES = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+
+# Decoding options per preset; none of them condition on previous text, which only helps long-form audio
+DECODING_PRESETS = {
+    'greedy': {'beam_size': None, 'temperature': 0.0},
+    'greedy_fallback': {'beam_size': None, 'temperature': FALLBACK_TEMPERATURES},
+    'beam': {'beam_size': 5, 'temperature': 0.0},
+    'beam_fallback': {'beam_size': 5, 'temperature': FALLBACK_TEMPERATURES}
+}
+
+def decoding_options(preset):
+    """Transcribe keyword arguments for a decoding preset"""
+    options = dict(DECODING_PRESETS[preset])
+    options['condition_on_previous_text'] = False
+    if options['beam_size'] is None:
+        del options['beam_size']
+    return options
+
+def set_thread_count(threads):
+    """Limit PyTorch intra-op threads (0 keeps the library default)"""
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+
+class InferenceBackend:
+    """A loaded speech model returning Whisper-shaped results: {'text', 'language', 'segments'}"""
+    
+    name = None
+    
+    def __init__(self, model_name, cpu_threads=0):
+        self.model_name = model_name
+        self.cpu_threads = cpu_threads
+        self.model = None
+    
+    def load(self):
+        raise NotImplementedError
+    
+    def detect_language(self, audio, allowed_languages):
+        """Most likely allowed language and its probability"""
+        raise NotImplementedError
+    
+    def transcribe(self, audio, language=None, **options):
+        """Transcribe a 16 kHz float32 array (or an audio file path)"""
+        raise NotImplementedError
+    
+    def transcribe_batch(self, audios, languages, **options):
+        """Transcribe several clips, each in its own language; backends without batching run them one by one"""
+        return [self.transcribe(audio, language=language, **options) for audio, language in zip(audios, languages)]
+    
+    def memory_mb(self):
+        """Approximate weight memory in MB (0 if unknown)"""
+        return 0.0
+    
+    def close(self):
+        """Release resources held outside the Python heap"""
+
+class WhisperBackend(InferenceBackend):
+    """Reference openai-whisper model running FP32 PyTorch"""
+    
+    name = 'whisper'
+    device = None
+    
+    def load(self):
+        import whisper
+        set_thread_count(self.cpu_threads)
+        self.model = whisper.load_model(self.model_name, device=self.device)
+        return self
+    
+    def detect_language(self, audio, allowed_languages):
+        return detect_allowed_language(self.model, audio, allowed_languages)
+    
+    def transcribe(self, audio, language=None, **options):
+        options.setdefault('fp16', self.model.device.type != 'cpu')
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return self.model.transcribe(audio, task='transcribe', language=language, **options)
+    
+    def transcribe_batch(self, audios, languages, **options):
+        """Greedy-decode clips of up to 30 s together: one stacked mel tensor and encoder pass per language"""
+        import torch
+        import whisper
+        greedy = not options.get('beam_size') and options.get('temperature', 0.0) == 0.0
+        if not greedy or any(isinstance(audio, str) or len(audio) > whisper.audio.N_SAMPLES for audio in audios):
+            return super().transcribe_batch(audios, languages, **options)
+        
+        fp16 = options.get('fp16', self.model.device.type != 'cpu')
+        # Same silence check transcribe() applies to each window, so batching can't surface hallucinated text
+        no_speech_threshold = options.get('no_speech_threshold', 0.6)
+        logprob_threshold = options.get('logprob_threshold', -1.0)
+        groups = {}
+        for index, language in enumerate(languages):
+            groups.setdefault(language, []).append(index)
+        
+        results = [None] * len(audios)
+        for language, indices in groups.items():
+            # The encoder only accepts full 30 s windows, so every clip is padded to N_FRAMES
+            mel = torch.stack([
+                whisper.log_mel_spectrogram(whisper.pad_or_trim(audios[index]), n_mels=self.model.dims.n_mels)
+                for index in indices
+            ]).to(self.model.device)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                decoded = whisper.decode(self.model, mel, whisper.DecodingOptions(
+                    task='transcribe', language=language, temperature=0.0, without_timestamps=True, fp16=fp16))
+            for index, result in zip(indices, decoded):
+                silent = (no_speech_threshold is not None and result.no_speech_prob > no_speech_threshold
+                          and (logprob_threshold is None or result.avg_logprob <= logprob_threshold))
+                duration = len(audios[index]) / WHISPER_SAMPLE_RATE
+                results[index] = {
+                    'text': "" if silent else result.text,
+                    'language': result.language,
+                    'segments': [] if silent else [{'start': 0.0, 'end': duration, 'text': result.text}]
+                }
+        return results
+    
+    def memory_mb(self):
+        state = self.model.state_dict()
+        return sum(t.numel() * t.element_size() for t in state.values() if hasattr(t, 'numel')) / (1024 * 1024)
+
+class QuantizedWhisperBackend(WhisperBackend):
+    """openai-whisper with its linear layers dynamically quantized to int8 for CPU"""
+    
+    name = 'whisper-int8'
+    device = 'cpu'
+    
+    def load(self):
+        import torch
+        super().load()
+        self._use_plain_linear(self.model)
+        self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+        return self
+    
+    @staticmethod
+    def _use_plain_linear(module):
+        """Swap whisper's Linear subclass for torch.nn.Linear so quantize_dynamic picks it up"""
+        import torch
+        for name, child in module.named_children():
+            if isinstance(child, torch.nn.Linear) and type(child) is not torch.nn.Linear:
+                plain = torch.nn.Linear(child.in_features, child.out_features, bias=child.bias is not None)
+                plain.load_state_dict(child.state_dict())
+                setattr(module, name, plain)
+            else:
+                QuantizedWhisperBackend._use_plain_linear(child)
+    
+    def memory_mb(self):
+        import torch
+        total = 0
+        for value in self.model.state_dict().values():
+            if isinstance(value, tuple):
+                value = value[0]
+            if isinstance(value, torch.Tensor):
+                total += value.numel() * value.element_size()
+        return total / (1024 * 1024)
+
+class FasterWhisperBackend(InferenceBackend):
+    """CTranslate2 engine from the optional faster-whisper package, int8 on CPU"""
+    
+    name = 'faster-whisper'
+    
+    def __init__(self, model_name, cpu_threads=0, compute_type='int8'):
+        super().__init__(model_name, cpu_threads)
+        self.compute_type = compute_type
+    
+    def load(self):
+        from faster_whisper import WhisperModel
+        self.model = WhisperModel(self.model_name, device='cpu', compute_type=self.compute_type, cpu_threads=self.cpu_threads)
+        return self
+    
+    def detect_language(self, audio, allowed_languages):
+        if not hasattr(self.model, 'detect_language'):
+            return None, 1.0
+        _, _, probs = self.model.detect_language(audio)
+        probs = dict(probs)
+        language = max(allowed_languages, key=lambda code: probs.get(code, 0.0))
+        return language, probs.get(language, 0.0)
+    
+    def transcribe(self, audio, language=None, **options):
+        options.pop('fp16', None)
+        options.pop('task', None)
+        if options.get('beam_size') is None:
+            options['beam_size'] = 1
+        segments, info = self.model.transcribe(audio, task='transcribe', language=language, **options)
+        segments = [{'start': seg.start, 'end': seg.end, 'text': seg.text} for seg in segments]
+        return {
+            'text': "".join(seg['text'] for seg in segments),
+            'language': info.language,
+            'segments': segments
+        }
+
+BACKENDS = {
+    WhisperBackend.name: WhisperBackend,
+    QuantizedWhisperBackend.name: QuantizedWhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend
+}
+
+def create_backend(backend_name, model_name, cpu_threads=0):
+    """Instantiate (but don't load) the backend selected by the `backend` config key"""
+    if backend_name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend_name}', expected one of {', '.join(BACKENDS)}")
+    return BACKENDS[backend_name](model_name, cpu_threads)
\ No newline at end of file
@@ -0,0 +1,266 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from inference_backends import InferenceBackend, create_backend
+
+# Room for 30 s of 16 kHz float32 before the shared block has to grow
+INITIAL_SHARED_BYTES = 30 * 16000 * 4
+
+def attach_shared_memory(name):
+    """Open an existing block without letting this process's resource tracker unlink it on exit"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        from multiprocessing import resource_tracker
+        shm = shared_memory.SharedMemory(name=name)
+        # A spawned child shares the parent's tracker, where the block is already registered and
+        # unregistering it would break the parent's unlink; only a tracker of our own must forget it
+        if getattr(resource_tracker._resource_tracker, '_pid', None) is not None:
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
+
+def serve(conn, backend_name, model_name, cpu_threads):
+    """Child process entry point: load the backend once, then answer requests until the pipe closes"""
+    try:
+        backend = create_backend(backend_name, model_name, cpu_threads).load()
+    except Exception as e:
+        conn.send(('error', f"{type(e).__name__}: {e}"))
+        return
+    conn.send(('ready', backend.memory_mb()))
+    
+    shm = None
+    while True:
+        try:
+            method, audio_ref, args, kwargs = conn.recv()
+        except EOFError:
+            break
+        if method == 'stop':
+            break
+        audio = None
+        try:
+            if isinstance(audio_ref, tuple):
+                name, length = audio_ref
+                if shm is None or shm.name != name:
+                    if shm:
+                        shm.close()
+                    shm = attach_shared_memory(name)
+                if isinstance(length, list):
+                    # A batch is packed back to back in the block
+                    offsets = np.cumsum([0] + length)
+                    packed = np.ndarray((offsets[-1],), dtype=np.float32, buffer=shm.buf)
+                    audio = [packed[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+                    packed = None
+                else:
+                    audio = np.ndarray((length,), dtype=np.float32, buffer=shm.buf)
+            else:
+                audio = audio_ref
+            conn.send(('ok', getattr(backend, method)(audio, *args, **kwargs)))
+        except Exception as e:
+            conn.send(('error', f"{type(e).__name__}: {e}"))
+        finally:
+            # The array borrows shm.buf, which can't be closed while it is referenced
+            audio = None
+    if shm:
+        shm.close()
+
+class InferenceServerBackend(InferenceBackend):
+    """Proxy for a backend kept resident in a child process, so decoding never competes with the GUI for the GIL.
+    
+    Audio is copied once into a reusable shared-memory block and only its name and length
+    cross the pipe. If the child dies or stops answering, it is restarted and the request retried.
+    """
+    
+    def __init__(self, backend_name, model_name, cpu_threads=0, retries=1, timeout_s=0):
+        super().__init__(model_name, cpu_threads)
+        self.name = backend_name
+        self.retries = retries
+        self.timeout_s = timeout_s
+        self.process = None
+        self.conn = None
+        self.shm = None
+        self.shared_audio = None
+        self.size_mb = 0.0
+        self.restarts = 0
+        self.last_audio = None
+        self.lock = threading.Lock()
+    
+    def load(self):
+        with self.lock:
+            self._spawn()
+        return self
+    
+    def _spawn(self):
+        context = multiprocessing.get_context('spawn')
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=serve,
+            args=(child_conn, self.name, self.model_name, self.cpu_threads),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        status, payload = self._receive(timeout_s=0)
+        if status != 'ready':
+            self._stop_process()
+            raise RuntimeError(f"Inference server failed to load '{self.model_name}': {payload}")
+        self.size_mb = payload
+    
+    def _restart(self):
+        self._stop_process()
+        self._spawn()
+        self.restarts += 1
+    
+    def _stop_process(self):
+        if self.process is None:
+            return
+        try:
+            if self.process.is_alive():
+                self.conn.send(('stop', None, (), {}))
+                self.process.join(timeout=2.0)
+        except (OSError, EOFError):
+            pass
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+        self.process = None
+        self.conn = None
+    
+    def _receive(self, timeout_s=None):
+        """Wait for a reply while watching the child, so a crash or hang can't block the caller forever"""
+        timeout_s = self.timeout_s if timeout_s is None else timeout_s
+        start = time.monotonic()
+        while not self.conn.poll(0.25):
+            if not self.process.is_alive():
+                raise EOFError(f"inference server exited with code {self.process.exitcode}")
+            if timeout_s and time.monotonic() - start > timeout_s:
+                self.process.kill()
+                raise TimeoutError(f"inference server did not answer within {timeout_s} s")
+        return self.conn.recv()
+    
+    def _share(self, audio):
+        """Copy audio (or a list of clips, back to back) into the shared block; file paths are sent as-is"""
+        if isinstance(audio, str):
+            return audio
+        if isinstance(audio, list):
+            if any(isinstance(clip, str) for clip in audio):
+                return audio
+            lengths = [len(clip) for clip in audio]
+            self._reserve(sum(lengths) * 4)
+            self.last_audio = None
+            offset = 0
+            for clip in audio:
+                self.shared_audio[offset:offset + len(clip)] = clip
+                offset += len(clip)
+            return self.shm.name, lengths
+        if audio is self.last_audio:
+            # detect_language and transcribe are called back to back on the same clip
+            return self.shm.name, len(audio)
+        self._reserve(len(audio) * 4)
+        self.last_audio = audio
+        self.shared_audio[:len(audio)] = audio
+        return self.shm.name, len(audio)
+    
+    def _reserve(self, nbytes):
+        """Make sure the shared block can hold `nbytes` of audio"""
+        if self.shm is None or self.shm.size < nbytes:
+            self._release_shared_memory()
+            self.shm = shared_memory.SharedMemory(create=True, size=max(INITIAL_SHARED_BYTES, nbytes))
+            self.shared_audio = np.ndarray((self.shm.size // 4,), dtype=np.float32, buffer=self.shm.buf)
+    
+    def _release_shared_memory(self):
+        if self.shm is None:
+            return
+        self.shared_audio = None
+        self.last_audio = None
+        self.shm.close()
+        self.shm.unlink()
+        self.shm = None
+    
+    def _failure_reason(self, error):
+        """Describe a failed call; a dropped pipe raises EOFError or OSError with no message of its own"""
+        reason = str(error) or "server process exited"
+        exitcode = self.process.exitcode if self.process is not None else None
+        if exitcode is not None and 'exit' not in str(error):
+            reason += f" (exit code {exitcode})"
+        return reason
+    
+    def _call(self, method, audio, *args, **kwargs):
+        with self.lock:
+            for attempt in range(self.retries + 1):
+                try:
+                    if self.process is None or not self.process.is_alive():
+                        self._restart()
+                    self.conn.send((method, self._share(audio), args, kwargs))
+                    status, payload = self._receive()
+                except (EOFError, OSError, TimeoutError) as e:
+                    if attempt == self.retries:
+                        raise RuntimeError(f"Inference server failed: {self._failure_reason(e)}") from e
+                    self._restart()
+                    continue
+                if status == 'error':
+                    raise RuntimeError(payload)
+                return payload
+    
+    def detect_language(self, audio, allowed_languages):
+        return self._call('detect_language', audio, allowed_languages)
+    
+    def transcribe(self, audio, language=None, **options):
+        return self._call('transcribe', audio, language=language, **options)
+    
+    def transcribe_batch(self, audios, languages, **options):
+        return self._call('transcribe_batch', list(audios), languages, **options)
+    
+    def memory_mb(self):
+        return self.size_mb
+    
+    def close(self):
+        """Stop the child process and free the shared block"""
+        with self.lock:
+            self._stop_process()
+            self._release_shared_memory()
+
+class ServerPool(InferenceBackend):
+    """Several inference servers for one model, so independent clips can be decoded in parallel"""
+    
+    def __init__(self, backend_name, model_name, workers, cpu_threads=0, retries=1, timeout_s=0):
+        super().__init__(model_name, cpu_threads)
+        self.name = backend_name
+        self.servers = [InferenceServerBackend(backend_name, model_name, cpu_threads, retries, timeout_s)
+                        for _ in range(workers)]
+    
+    def load(self):
+        try:
+            with ThreadPoolExecutor(max_workers=len(self.servers)) as executor:
+                list(executor.map(lambda server: server.load(), self.servers))
+        except Exception:
+            self.close()
+            raise
+        return self
+    
+    def detect_language(self, audio, allowed_languages):
+        return self.servers[0].detect_language(audio, allowed_languages)
+    
+    def transcribe(self, audio, language=None, **options):
+        return self.servers[0].transcribe(audio, language=language, **options)
+    
+    def transcribe_batch(self, audios, languages, **options):
+        """Full transcriptions of each clip, clip i on server i % n; each proxy's lock queues clips sharing a server"""
+        audios, languages = list(audios), list(languages)
+        
+        def run(index):
+            server = self.servers[index % len(self.servers)]
+            return server.transcribe(audios[index], language=languages[index], **options)
+        
+        with ThreadPoolExecutor(max_workers=len(self.servers)) as executor:
+            return list(executor.map(run, range(len(audios))))
+    
+    def memory_mb(self):
+        return sum(server.memory_mb() for server in self.servers)
+    
+    def close(self):
+        for server in self.servers:
+            server.close()
@@ -0,0 +1,160 @@
+import itertools
+import queue
+import threading
+import time
+
+class InferenceJob:
+    """A unit of work for the inference worker"""
+    
+    def __init__(self, job_id, target, args, batch_target=None, on_cancel=None):
+        self.job_id = job_id
+        self.target = target
+        self.args = args
+        self.batch_target = batch_target
+        self.on_cancel = on_cancel
+        self._cancelled = threading.Event()
+    
+    def cancel(self):
+        """Mark the job as cancelled and run its `on_cancel` hook once; a running job drops its result when it finishes"""
+        if self._cancelled.is_set():
+            return
+        self._cancelled.set()
+        if self.on_cancel:
+            self.on_cancel()
+    
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+class InferenceWorker:
+    """Single long-lived thread that runs inference jobs in FIFO order from a bounded queue.
+    
+    Jobs submitted with a `batch_target` are grouped with the queued jobs right behind them
+    that share it (up to `max_batch`, waiting at most `max_wait_ms` for more), and the whole
+    group is handed to `batch_target(jobs)` in one call.
+    """
+    
+    def __init__(self, message_queue, max_queue=4, max_batch=1, max_wait_ms=0):
+        self.message_queue = message_queue
+        self.jobs = queue.Queue(maxsize=max_queue)
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait_ms / 1000.0
+        self.current_jobs = []
+        self.deferred = None
+        self.ids = itertools.count(1)
+        self.thread = None
+        self.running = False
+    
+    def start(self):
+        """Start the worker thread"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def submit(self, target, *args, batch_target=None, on_cancel=None):
+        """Queue `target(*args, job=job)`; returns the job, or None if the queue is full"""
+        job = InferenceJob(next(self.ids), target, args, batch_target, on_cancel)
+        try:
+            self.jobs.put_nowait(job)
+        except queue.Full:
+            self.message_queue.put(("error", "Transcription queue is full, utterance dropped"))
+            return None
+        self._report_depth()
+        return job
+    
+    def queue_depth(self):
+        """Number of queued jobs plus the ones in flight"""
+        return self.jobs.qsize() + (1 if self.deferred else 0) + len(self.current_jobs)
+    
+    def cancel_pending(self):
+        """Cancel every queued job and the ones in flight; returns how many were cancelled"""
+        cancelled = 0
+        deferred, self.deferred = self.deferred, None
+        if deferred:
+            deferred.cancel()
+            cancelled += 1
+        stopping = False
+        while True:
+            try:
+                job = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                stopping = True
+                continue
+            job.cancel()
+            cancelled += 1
+        if stopping:
+            self.jobs.put_nowait(None)
+        
+        for job in list(self.current_jobs):
+            if not job.cancelled:
+                job.cancel()
+                cancelled += 1
+        
+        self._report_depth()
+        return cancelled
+    
+    def _report_depth(self):
+        self.message_queue.put(("queue_depth", self.queue_depth()))
+    
+    def _next_job(self):
+        if self.deferred:
+            job, self.deferred = self.deferred, None
+            return job
+        return self.jobs.get()
+    
+    def _collect(self, job):
+        """Gather the queued jobs behind `job` that share its batch target"""
+        batch = [job]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            try:
+                remaining = deadline - time.monotonic()
+                candidate = self.jobs.get(timeout=remaining) if remaining > 0 else self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            if candidate is None:
+                # stop() was called: finish this batch, then leave the loop without waiting for more jobs
+                self.running = False
+                break
+            if candidate.cancelled:
+                continue
+            if candidate.batch_target != job.batch_target:
+                # Keep FIFO order: run it right after this batch
+                self.deferred = candidate
+                break
+            batch.append(candidate)
+        return batch
+    
+    def _run(self):
+        while self.running:
+            job = self._next_job()
+            if job is None:
+                break
+            if job.cancelled:
+                continue
+            
+            batch = self._collect(job) if job.batch_target and self.max_batch > 1 else [job]
+            self.current_jobs = batch
+            self._report_depth()
+            try:
+                if len(batch) > 1:
+                    job.batch_target(batch)
+                else:
+                    job.target(*job.args, job=job)
+            except Exception as e:
+                self.message_queue.put(("error", f"Inference job {job.job_id} failed: {e}"))
+            finally:
+                self.current_jobs = []
+                self._report_depth()
+    
+    def stop(self):
+        """Stop the worker after the job in flight"""
+        self.running = False
+        try:
+            self.jobs.put_nowait(None)
+        except queue.Full:
+            pass
\ No newline at end of file
@@ -0,0 +1,10 @@
+def detect_allowed_language(model, audio, allowed_languages):
+    """Detect the language on the first 30 s mel window, restricted to `allowed_languages`"""
+    import whisper
+    
+    segment = whisper.pad_or_trim(audio)
+    mel = whisper.log_mel_spectrogram(segment, model.dims.n_mels).to(model.device)
+    _, probs = model.detect_language(mel)
+    
+    language = max(allowed_languages, key=lambda code: probs.get(code, 0.0))
+    return language, probs.get(language, 0.0)
\ No newline at end of file
@@ -0,0 +1,121 @@
+import os
+import re
+import numpy as np
+from audio_utils import WHISPER_SAMPLE_RATE
+from inference_backends import decoding_options
+
+FRAME_MS = 20
+
+def split_audio(audio, max_chunk_s=28, min_chunk_s=5, min_silence_ms=300, overlap_s=1.0, rate=WHISPER_SAMPLE_RATE):
+    """Split audio into (start, end, overlaps_next) sample ranges, cutting in the middle of pauses.
+    
+    Where no pause falls inside a window, it is cut at `max_chunk_s` and the next chunk starts
+    `overlap_s` earlier so no word is lost at the seam.
+    """
+    frame = rate * FRAME_MS // 1000
+    count = len(audio) // frame
+    cuts = np.array([], dtype=np.int64)
+    if count:
+        energy = np.sqrt(np.mean(audio[:count * frame].reshape(count, frame) ** 2, axis=1))
+        silent = energy < max(np.percentile(energy, 10) * 2.0, 1e-3)
+        edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+        run_starts, run_ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+        keep = run_ends - run_starts >= max(1, min_silence_ms // FRAME_MS)
+        cuts = (run_starts[keep] + run_ends[keep]) // 2 * frame
+    
+    max_length, min_length, overlap = int(max_chunk_s * rate), int(min_chunk_s * rate), int(overlap_s * rate)
+    chunks = []
+    start = 0
+    while len(audio) - start > max_length:
+        candidates = cuts[(cuts >= start + min_length) & (cuts <= start + max_length)]
+        if len(candidates):
+            end = int(candidates[-1])
+            chunks.append((start, end, False))
+            start = end
+        else:
+            end = start + max_length
+            chunks.append((start, end, True))
+            start = end - overlap
+    chunks.append((start, len(audio), False))
+    return chunks
+
+def _units(text, language):
+    return list(text.replace(" ", "")) if language == 'zh' else text.split()
+
+def _normalize(unit):
+    return re.sub(r"[^\w]", "", unit.lower())
+
+def merge_overlap(left, right, language, max_units=12):
+    """Drop the start of `right` that repeats the end of `left`; returns the remainder of `right`"""
+    left_units, right_units = _units(left, language), _units(right, language)
+    left_norm = [_normalize(unit) for unit in left_units[-max_units:]]
+    right_norm = [_normalize(unit) for unit in right_units[:max_units]]
+    for size in range(min(len(left_norm), len(right_norm)), 0, -1):
+        if left_norm[-size:] == right_norm[:size]:
+            right_units = right_units[size:]
+            break
+    return ("" if language == 'zh' else " ").join(right_units)
+
+class LongFormTranscriber:
+    """Transcribes long recordings as silence-split chunks in parallel on the model manager's server pool"""
+    
+    def __init__(self, config_manager, model_manager, model_lock, message_queue):
+        self.config_manager = config_manager
+        self.model_manager = model_manager
+        self.model_lock = model_lock
+        self.message_queue = message_queue
+        self.reported_no_pool = False
+    
+    def applies(self, audio):
+        """Whether a clip is long enough to be worth splitting and a worker pool is ready for it.
+        
+        The first long clip starts the pool in the background and is transcribed the usual way.
+        """
+        config = self.config_manager.snapshot
+        if not config.longform_mode or len(audio) <= config.longform_min_s * WHISPER_SAMPLE_RATE:
+            return False
+        if not config.inference_process:
+            if not self.reported_no_pool:
+                self.reported_no_pool = True
+                self.message_queue.put(("log", "Long-form mode needs inference_process; transcribing long clips in one pass"))
+            return False
+        return self.model_manager.get_pool(self.worker_count()) is not None
+    
+    def worker_count(self):
+        workers = self.config_manager.get('longform_workers')
+        return workers or max(1, min(4, (os.cpu_count() or 2) // 2))
+    
+    def transcribe(self, audio):
+        """Whisper-style result for a long clip, or None if the language gate rejects it"""
+        config = self.config_manager.snapshot
+        chunks = split_audio(audio, config.longform_chunk_s, overlap_s=config.longform_overlap_s)
+        
+        first_start, first_end, _ = chunks[0]
+        model = self.model_manager.active_model
+        with self.model_lock:
+            language, probability = model.detect_language(audio[first_start:first_end], config.allowed_languages)
+        if probability < config.language_min_probability:
+            return None
+        
+        options = decoding_options(config.decoding_preset)
+        clips = [audio[start:end] for start, end, _ in chunks]
+        pool = self.model_manager.get_pool(self.worker_count())
+        if pool:
+            results = pool.transcribe_batch(clips, [language] * len(clips), **options)
+        else:
+            # The pool was evicted since applies(); decode the chunks one by one on the active model
+            with self.model_lock:
+                results = [model.transcribe(clip, language=language, **options) for clip in clips]
+        
+        texts, segments = [], []
+        for (start, end, _), previous, result in zip(chunks, [None] + chunks[:-1], results):
+            text = result["text"].strip()
+            if previous and previous[2] and texts:
+                text = merge_overlap(texts[-1], text, language)
+            texts.append(text)
+            offset = start / WHISPER_SAMPLE_RATE
+            segments.extend({**seg, 'start': seg['start'] + offset, 'end': seg['end'] + offset}
+                            for seg in result.get("segments", []))
+        
+        joiner = "" if language == 'zh' else " "
+        return {"text": joiner.join(text for text in texts if text), "language": language, "segments": segments}
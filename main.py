@@ -1,14 +1,27 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
-import queue
+import argparse
+import sys
 import time
 import warnings
-from config_manager import ConfigManager
-from audio_handler import AudioHandler
-from translation_manager import TranslationManager
-from roblox_interface import RobloxInterface
-from hotkey_manager import HotkeyManager
-from splash_screen import SplashScreen
+from startup_profiler import profiler
+
+if "--profile-startup" in sys.argv:
+    profiler.enable()
+
+with profiler.measure("import app modules"):
+    from config_manager import ConfigManager
+    from audio_handler import AudioHandler
+    from translation_manager import TranslationManager
+    from roblox_interface import RobloxInterface
+    from hotkey_manager import HotkeyManager
+    from splash_screen import SplashScreen
+    from message_bus import MessageBus
+    from tracing import tracer
+    from inference_backends import BACKENDS
+
+SETTINGS_WIDGET_KEYS = ('mic_name', 'mic_index', 'model_name', 'backend', 'hotkey', 'translation_trigger',
+                        'stop_translation', 'roblox_window_title', 'enable_chinese_autocorrect')
 
 warnings.filterwarnings("ignore")
 
@@ -24,38 +37,67 @@ class VoiceTranscriberGUI:
         
         self.check_splash()
 
-        self.config_manager = ConfigManager()
-        self.message_queue = queue.Queue()
-        
-        self.audio_handler = AudioHandler(self.config_manager, self.message_queue)
-        self.translation_manager = TranslationManager(self.config_manager, self.message_queue)
-        self.roblox_interface = RobloxInterface(self.config_manager, self.message_queue)
-        self.hotkey_manager = HotkeyManager(self.config_manager, self.message_queue)
+        with profiler.measure("ConfigManager"):
+            self.config_manager = ConfigManager()
+        tracer.configure(self.config_manager)
+        self.message_queue = MessageBus()
+        
+        with profiler.measure("AudioHandler"):
+            self.audio_handler = AudioHandler(self.config_manager, self.message_queue)
+        with profiler.measure("TranslationManager"):
+            self.translation_manager = TranslationManager(self.config_manager, self.message_queue)
+        with profiler.measure("RobloxInterface"):
+            self.roblox_interface = RobloxInterface(self.config_manager, self.message_queue)
+        with profiler.measure("HotkeyManager"):
+            self.hotkey_manager = HotkeyManager(self.config_manager, self.message_queue)
         
         self.is_recording = False
+        self.ready_components = set()
+        self.pending_log = []
+        self.log_flush_scheduled = False
         
-        self.setup_ui()
-        self.setup_components()
-        self.process_messages()
+        with profiler.measure("setup_ui"):
+            self.setup_ui()
+        self.mark_component_ready("ui")
+        with profiler.measure("setup_components"):
+            self.setup_components()
+        self.message_queue.attach(self.root, self.process_messages)
+        self.poll_messages()
     
     def check_splash(self):
         if self.splash_screen.update():
             self.root.after(100, self.check_splash)
         else:
-            self.splash.destroy()
             self.root.deiconify()
-            self.setup_ui()
-            self.setup_components()
-            self.process_messages()
+    
+    def mark_component_ready(self, component):
+        """Forward a readiness signal to the splash screen and startup profile"""
+        self.ready_components.add(component)
+        self.splash_screen.mark_ready(component)
+        profiler.mark(f"{component} ready")
+        if {"model", "translation"} <= self.ready_components:
+            profiler.report()
 
     def setup_components(self):
         """Initialize all components"""
+        self.message_queue.subscribe("audio_processed", self.process_audio_result)
+        self.message_queue.subscribe("send_message", self.send_canned_message)
+        
         self.audio_handler.load_model_async()
+        if self.config_manager.get('persistent_capture'):
+            self.audio_handler.start_capture_async()
         
         self.translation_manager.setup_translation_async()
         
         self.hotkey_manager.register_hotkey('recording_toggle', self.toggle_recording)
+        self.hotkey_manager.register_hotkey('push_to_talk', self.start_push_to_talk, self.stop_push_to_talk)
+        self.hotkey_manager.register_hotkey('toggle_translation', self.toggle_translation_mode)
+        self.hotkey_manager.register_hotkey('cancel_pending', self.cancel_pending)
         self.hotkey_manager.setup_hotkeys()
+        
+        self.config_manager.subscribe(('model_name', 'backend'), lambda snapshot, changed: self.audio_handler.switch_model_async(snapshot.model_name))
+        self.config_manager.subscribe(SETTINGS_WIDGET_KEYS, lambda snapshot, changed: self.message_queue.put(("config_changed", changed)))
+        self.config_manager.start_watching()
     
     def setup_ui(self):
         main_frame = ttk.Frame(self.root, padding="10")
@@ -70,6 +112,9 @@ class VoiceTranscriberGUI:
         self.recording_indicator = ttk.Label(status_frame, text="⚫", foreground="red")
         self.recording_indicator.grid(row=0, column=1, sticky=tk.E)
         
+        self.queue_label = ttk.Label(status_frame, text="Queue: 0")
+        self.queue_label.grid(row=0, column=2, sticky=tk.E, padx=(10, 0))
+        
         controls_frame = ttk.LabelFrame(main_frame, text="Controls", padding="5")
         controls_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
         
@@ -79,8 +124,11 @@ class VoiceTranscriberGUI:
         self.translation_button = ttk.Button(controls_frame, text="Toggle Translation Mode", command=self.toggle_translation_mode)
         self.translation_button.grid(row=0, column=1, padx=(0, 5))
         
+        self.cancel_button = ttk.Button(controls_frame, text="Cancel Pending", command=self.cancel_pending)
+        self.cancel_button.grid(row=0, column=2, padx=(0, 5))
+        
         self.clear_button = ttk.Button(controls_frame, text="Clear Log", command=self.clear_log)
-        self.clear_button.grid(row=0, column=2)
+        self.clear_button.grid(row=0, column=3)
         
         settings_frame = ttk.LabelFrame(main_frame, text="Settings", padding="5")
         settings_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
@@ -100,6 +148,11 @@ class VoiceTranscriberGUI:
         self.hotkey_entry.insert(0, self.config_manager.get('hotkey'))
         self.hotkey_entry.grid(row=2, column=1, sticky=(tk.W, tk.E), padx=(5, 0), pady=(5, 0))
         
+        ttk.Label(settings_frame, text="Backend:").grid(row=3, column=0, sticky=tk.W, pady=(5, 0))
+        self.backend_combo = ttk.Combobox(settings_frame, values=list(BACKENDS), state="readonly")
+        self.backend_combo.set(self.config_manager.get('backend'))
+        self.backend_combo.grid(row=3, column=1, sticky=(tk.W, tk.E), padx=(5, 0), pady=(5, 0))
+        
         trigger_frame = ttk.LabelFrame(main_frame, text="Trigger Phrases", padding="5")
         trigger_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
         
@@ -130,6 +183,7 @@ class VoiceTranscriberGUI:
         
         self.log_text = scrolledtext.ScrolledText(log_frame, height=15, wrap=tk.WORD)
         self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.log_text.tag_configure("partial", foreground="gray")
 
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(0, weight=1)
@@ -139,6 +193,13 @@ class VoiceTranscriberGUI:
         trigger_frame.columnconfigure(1, weight=1)
         log_frame.columnconfigure(0, weight=1)
         log_frame.rowconfigure(0, weight=1)
+        
+        if tracer.enabled:
+            perf_frame = ttk.LabelFrame(main_frame, text="Performance", padding="5")
+            perf_frame.grid(row=5, column=0, columnspan=2, sticky=(tk.W, tk.E))
+            self.perf_label = ttk.Label(perf_frame, text="No utterances yet", justify=tk.LEFT, wraplength=850)
+            self.perf_label.grid(row=0, column=0, sticky=tk.W)
+            self.update_performance_panel()
     
     def populate_microphones(self):
         """Populate microphone dropdown"""
@@ -146,43 +207,65 @@ class VoiceTranscriberGUI:
         self.mic_combo['values'] = devices
         
         if devices:
-            for device in devices:
-                if device.startswith(str(self.config_manager.get('mic_index'))):
-                    self.mic_combo.set(device)
-                    break
-            else:
-                self.mic_combo.set(devices[0])
+            device = self.audio_handler.probe.find(self.config_manager.get('mic_name'), self.config_manager.get('mic_index'))
+            selection = f"{device['index']}: {device['name']}" if device else None
+            self.mic_combo.set(selection if selection in devices else devices[0])
     
     def save_settings(self):
         """Save all settings to configuration"""
         mic_selection = self.mic_combo.get()
         mic_index = self.config_manager.get('mic_index')
+        mic_name = self.config_manager.get('mic_name')
         if mic_selection:
             try:
-                mic_index = int(mic_selection.split(':')[0])
-            except (ValueError, IndexError):
+                index, name = mic_selection.split(':', 1)
+                mic_index, mic_name = int(index), name.strip()
+            except ValueError:
                 pass
         
         self.config_manager.update({
             'mic_index': mic_index,
+            'mic_name': mic_name,
             'translation_trigger': self.start_translation_entry.get(),
             'stop_translation': self.stop_translation_entry.get(),
             'roblox_window_title': self.roblox_title_entry.get(),
             'enable_chinese_autocorrect': self.chinese_correct_var.get(),
             'hotkey': self.hotkey_entry.get(),
             'model_name': self.model_combo.get(),
+            'backend': self.backend_combo.get(),
             'rate': self.config_manager.get('rate'),
             'chunk': self.config_manager.get('chunk'),
             'channels': self.config_manager.get('channels')
         })
         
         if self.config_manager.save_config():
-            self.hotkey_manager.update_hotkey(self.hotkey_entry.get())
             self.log_message("Settings saved successfully")
-            self.log_message(f"Saved config: mic_index={self.config_manager.get('mic_index')}, model={self.config_manager.get('model_name')}")
+            self.log_message(f"Saved config: mic={self.config_manager.get('mic_name')}, model={self.config_manager.get('model_name')}")
         else:
             self.log_message("Failed to save settings to file")
     
+    def refresh_settings(self, keys):
+        """Show config values that changed outside the settings form"""
+        snapshot = self.config_manager.snapshot
+        entries = {
+            'hotkey': self.hotkey_entry,
+            'translation_trigger': self.start_translation_entry,
+            'stop_translation': self.stop_translation_entry,
+            'roblox_window_title': self.roblox_title_entry
+        }
+        for key, entry in entries.items():
+            if key in keys and entry.get() != snapshot.get(key):
+                entry.delete(0, tk.END)
+                entry.insert(0, snapshot.get(key))
+        if 'model_name' in keys:
+            self.model_combo.set(snapshot.model_name)
+        if 'backend' in keys:
+            self.backend_combo.set(snapshot.backend)
+        if 'enable_chinese_autocorrect' in keys:
+            self.chinese_correct_var.set(snapshot.enable_chinese_autocorrect)
+        if keys & {'mic_name', 'mic_index'}:
+            self.populate_microphones()
+    
     def toggle_recording(self):
         """Toggle audio recording on/off"""
         if not self.audio_handler.model:
@@ -205,10 +288,29 @@ class VoiceTranscriberGUI:
             
             self.audio_handler.start_recording(mic_index)
         else:
-            self.record_button.config(text="Start Recording (F2)")
-            self.recording_indicator.config(text="⚫", foreground="gray")
+            self.set_recording_stopped()
             self.audio_handler.stop_recording()
     
+    def start_push_to_talk(self):
+        """Begin recording while the push-to-talk key is held"""
+        if not self.is_recording:
+            self.toggle_recording()
+    
+    def stop_push_to_talk(self):
+        """Stop recording when the push-to-talk key is released"""
+        if self.is_recording:
+            self.toggle_recording()
+    
+    def set_recording_stopped(self):
+        """Reset the recording controls to the idle state"""
+        self.is_recording = False
+        self.record_button.config(text="Start Recording (F2)")
+        self.recording_indicator.config(text="⚫", foreground="gray")
+    
+    def cancel_pending(self):
+        """Cancel queued and in-flight transcriptions, e.g. before recording a correction"""
+        self.audio_handler.cancel_pending()
+    
     def toggle_translation_mode(self):
         """Toggle translation mode on/off"""
         mode = self.translation_manager.toggle_translation_mode()
@@ -222,71 +324,137 @@ class VoiceTranscriberGUI:
         status = "ON" if translation_active else "OFF"
         self.translation_button.config(text=f"Translation Mode: {status}")
     
+    def update_performance_panel(self):
+        """Refresh rolling stage averages and the latest real-time factor"""
+        summary = tracer.summary()
+        if summary:
+            stages = "  ".join(f"{stage}: {ms:.0f} ms" for stage, ms in summary.items())
+            rtf = f"  |  RTF: {tracer.latest_rtf:.2f}" if tracer.latest_rtf is not None else ""
+            self.perf_label.config(text=stages + rtf)
+        self.root.after(1000, self.update_performance_panel)
+    
     def clear_log(self):
         """Clear the log text area"""
+        self.pending_log.clear()
         self.log_text.delete(1.0, tk.END)
     
     def log_message(self, message):
-        """Add a timestamped message to the log"""
+        """Queue a timestamped message for the next batched log update"""
         timestamp = time.strftime("%H:%M:%S")
-        self.log_text.insert(tk.END, f"[{timestamp}] {message}\n")
+        self.pending_log.append(f"[{timestamp}] {message}\n")
+        if not self.log_flush_scheduled:
+            self.log_flush_scheduled = True
+            self.root.after(16, self.flush_log)
+    
+    def flush_log(self):
+        """Write all pending log lines in one widget update and cap the log length"""
+        self.log_flush_scheduled = False
+        if not self.pending_log:
+            return
+        
+        self.clear_partial()
+        self.log_text.insert(tk.END, "".join(self.pending_log))
+        self.pending_log.clear()
+        
+        max_lines = self.config_manager.get('log_max_lines')
+        line_count = int(self.log_text.index('end-1c').split('.')[0])
+        if max_lines and line_count > max_lines:
+            self.log_text.delete('1.0', f'{line_count - max_lines + 1}.0')
+        self.log_text.see(tk.END)
+    
+    def show_partial(self, text):
+        """Show the current streaming hypothesis, replacing the previous one"""
+        self.flush_log()
+        self.clear_partial()
+        self.log_text.insert(tk.END, f"... {text}\n", "partial")
         self.log_text.see(tk.END)
     
-    def process_audio_result(self, raw_text, lang):
-        """Process the result from audio transcription"""
+    def clear_partial(self):
+        """Remove the streaming hypothesis line from the log"""
+        ranges = self.log_text.tag_ranges("partial")
+        if ranges:
+            self.log_text.delete(ranges[0], ranges[-1])
+    
+    def process_audio_result(self, content):
+        """Process the result from audio transcription (runs on the message bus dispatcher)"""
+        raw_text, lang, trace_id = content
         if raw_text is None or lang is None:
             return
         
-        corrected_text, corrections = self.translation_manager.correct_transcription(raw_text, lang)
+        with tracer.span(trace_id, 'correction'):
+            corrected_text, corrections = self.translation_manager.correct_transcription(raw_text, lang)
         
-        if self.translation_manager.check_trigger_phrases(corrected_text, lang):
-            return
+        with tracer.span(trace_id, 'trigger_matching'):
+            if self.translation_manager.check_trigger_phrases(corrected_text, lang):
+                return
         
         if self.translation_manager.is_translation_active() and lang == 'en':
-            translated_text = self.translation_manager.translate_to_chinese(corrected_text)
-            self.log_message(f"Original: {corrected_text}")
-            self.log_message(f"Chinese: {translated_text}")
-            self.roblox_interface.send_message(translated_text)
+            with tracer.span(trace_id, 'translation'):
+                translated_text = self.translation_manager.translate_to_chinese(corrected_text)
+            self.message_queue.put(("log", f"Original: {corrected_text}"))
+            self.message_queue.put(("log", f"Chinese: {translated_text}"))
+            self.roblox_interface.send_message(translated_text, trace_id)
         else:
-            self.log_message(f"Transcribed ({lang}): {corrected_text}")
-            self.roblox_interface.send_message(corrected_text)
+            self.message_queue.put(("log", f"Transcribed ({lang}): {corrected_text}"))
+            self.roblox_interface.send_message(corrected_text, trace_id)
+    
+    def send_canned_message(self, text):
+        """Send a message triggered by a voice command (runs on the message bus dispatcher)"""
+        self.message_queue.put(("log", f"Sending: {text}"))
+        self.roblox_interface.send_message(text)
+    
+    def poll_messages(self):
+        """Fallback poll in case a wake-up event was missed"""
+        self.process_messages()
+        self.root.after(self.config_manager.get('message_poll_ms'), self.poll_messages)
     
     def process_messages(self):
-        """Process messages from the message queue"""
-        try:
-            while True:
-                msg_type, content = self.message_queue.get_nowait()
-                
-                if msg_type == "status":
-                    self.status_label.config(text=content)
-                elif msg_type == "log":
-                    self.log_message(content)
-                elif msg_type == "error":
-                    self.log_message(f"ERROR: {content}")
-                elif msg_type == "enable_controls":
-                    self.record_button.config(state="normal")
-                    self.status_label.config(text="Ready - Press F2 to start recording")
-                elif msg_type == "translation_mode_changed":
-                    self.update_translation_button(content)
-                elif msg_type == "audio_processed":
-                    raw_text, lang = content
-                    self.process_audio_result(raw_text, lang)
-                    
-        except queue.Empty:
-            pass
-        
-        self.root.after(100, self.process_messages)
+        """Process messages from the message bus"""
+        for msg_type, content in self.message_queue.drain():
+            if msg_type == "status":
+                self.status_label.config(text=content)
+                self.splash_screen.set_status(content)
+            elif msg_type == "log":
+                self.log_message(content)
+            elif msg_type == "partial":
+                self.show_partial(content)
+            elif msg_type == "recording_stopped":
+                self.set_recording_stopped()
+            elif msg_type == "queue_depth":
+                self.queue_label.config(text=f"Queue: {content}")
+            elif msg_type == "component_ready":
+                self.mark_component_ready(content)
+            elif msg_type == "switch_model":
+                self.config_manager.set('model_name', content)
+            elif msg_type == "hotkey":
+                self.hotkey_manager.dispatch(content)
+            elif msg_type == "config_changed":
+                self.refresh_settings(content)
+            elif msg_type == "error":
+                self.log_message(f"ERROR: {content}")
+            elif msg_type == "enable_controls":
+                self.record_button.config(state="normal")
+                self.status_label.config(text="Ready - Press F2 to start recording")
+            elif msg_type == "translation_mode_changed":
+                self.update_translation_button(content)
     
     def on_closing(self):
         """Handle application closing"""
         try:
+            self.config_manager.stop_watching()
             self.hotkey_manager.cleanup()
             self.audio_handler.cleanup()
+            self.translation_manager.cleanup()
+            self.roblox_interface.cleanup()
         except:
             pass
         self.root.destroy()
 
 def main():
+    parser = argparse.ArgumentParser(description="Voice Transcriber for Roblox")
+    parser.add_argument('--profile-startup', action='store_true', help="print import and init timings per component")
+    parser.parse_args()
+    
     root = tk.Tk()
     app = VoiceTranscriberGUI(root)
     root.protocol("WM_DELETE_WINDOW", app.on_closing)
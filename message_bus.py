@@ -0,0 +1,74 @@
+import queue
+import threading
+from collections import namedtuple
+
+Message = namedtuple('Message', ['type', 'content'])
+
+class MessageBus:
+    """Queue-compatible message bus that wakes the Tk loop as soon as a message is posted.
+    
+    Message types with a subscriber are dispatched on a background thread instead of the
+    Tk thread, so work such as sending a finished transcription never waits on the GUI.
+    """
+    
+    EVENT = "<<BusMessage>>"
+    
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.dispatch_queue = queue.Queue()
+        self.handlers = {}
+        self.root = None
+        self.wakeup_pending = False
+        self.dispatcher = None
+    
+    def attach(self, root, callback):
+        """Call `callback` on the Tk thread whenever GUI messages are waiting"""
+        self.root = root
+        root.bind(self.EVENT, lambda event: callback())
+    
+    def subscribe(self, msg_type, handler):
+        """Handle `msg_type` on the dispatcher thread instead of the Tk thread"""
+        self.handlers[msg_type] = handler
+        if self.dispatcher is None:
+            self.dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+            self.dispatcher.start()
+    
+    def put(self, message):
+        """Post a (type, content) message"""
+        message = Message(*message)
+        if message.type in self.handlers:
+            self.dispatch_queue.put(message)
+            return
+        self.queue.put(message)
+        self._wake()
+    
+    def _wake(self):
+        if self.root is None or self.wakeup_pending:
+            return
+        self.wakeup_pending = True
+        try:
+            self.root.event_generate(self.EVENT, when='tail')
+        except Exception:
+            # Tk not ready or shutting down; the fallback poll picks the message up
+            self.wakeup_pending = False
+    
+    def get_nowait(self):
+        return self.queue.get_nowait()
+    
+    def drain(self):
+        """Return every message waiting for the Tk thread"""
+        self.wakeup_pending = False
+        messages = []
+        while True:
+            try:
+                messages.append(self.queue.get_nowait())
+            except queue.Empty:
+                return messages
+    
+    def _dispatch(self):
+        while True:
+            message = self.dispatch_queue.get()
+            try:
+                self.handlers[message.type](message.content)
+            except Exception as e:
+                self.put(("error", f"{message.type} handler failed: {e}"))
\ No newline at end of file
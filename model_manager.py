@@ -0,0 +1,211 @@
+import gc
+import os
+import threading
+import time
+import warnings
+from collections import OrderedDict
+import numpy as np
+from audio_utils import WHISPER_SAMPLE_RATE
+from startup_profiler import profiler
+from inference_backends import create_backend
+from inference_server import InferenceServerBackend, ServerPool
+
+class ModelManager:
+    """Loads models on demand through the configured backend and keeps the most recently used ones in an LRU cache"""
+    
+    def __init__(self, config_manager, message_queue):
+        self.config_manager = config_manager
+        self.message_queue = message_queue
+        self.models = OrderedDict()
+        self.sizes = {}
+        self.last_used = {}
+        self.lock = threading.RLock()
+        self.active_name = None
+        self.active_key = None
+        self.active_model = None
+        self.idle_thread = None
+        self.loading = {}
+        self.pools_loading = set()
+    
+    def get(self, name, backend_name=None):
+        """Return a loaded backend for a model, loading and warming it up if needed.
+        
+        Loading happens outside the cache lock, so eviction, pools and the idle monitor keep
+        working during a multi-second load; concurrent callers for the same key wait for it.
+        """
+        key = (backend_name or self.config_manager.get('backend'), name)
+        while True:
+            with self.lock:
+                if key in self.models:
+                    self.models.move_to_end(key)
+                    self.last_used[key] = time.time()
+                    return self.models[key]
+                loading = self.loading.get(key)
+                if loading is None:
+                    loading = self.loading[key] = threading.Event()
+                    break
+            # Another thread is loading this key; use its result, or retry if that load failed
+            loading.wait()
+        
+        try:
+            self.message_queue.put(("status", f"Loading {key[0]} model '{name}'..."))
+            with profiler.measure(f"load {key[0]} model '{name}'"):
+                model = self.create(*key).load()
+            with profiler.measure(f"warm up model '{name}'"):
+                self.warm_up(model)
+        except Exception:
+            with self.lock:
+                self.loading.pop(key).set()
+            raise
+        
+        with self.lock:
+            self.models[key] = model
+            self.sizes[key] = model.memory_mb()
+            self.last_used[key] = time.time()
+            self.loading.pop(key).set()
+            self._evict(keep=key)
+        return model
+    
+    def create(self, backend_name, name):
+        """Backend instance for a key, hosted in a child process when `inference_process` is on"""
+        threads = self.config_manager.get('torch_threads')
+        if self.config_manager.get('inference_process'):
+            return InferenceServerBackend(backend_name, name, threads,
+                                          retries=self.config_manager.get('inference_retries'),
+                                          timeout_s=self.config_manager.get('inference_timeout_s'))
+        return create_backend(backend_name, name, cpu_threads=threads)
+    
+    def get_pool(self, workers):
+        """Server pool for the active model, or None while it is starting in the background or can't be used.
+        
+        Pools are cached next to the models as `(backend, "<model> xN")`, so they count
+        against `model_cache_size` and the memory budget and are unloaded when idle.
+        """
+        if not self.config_manager.get('inference_process') or self.active_key is None:
+            return None
+        backend_name, name = self.active_key
+        key = (backend_name, f"{name} x{workers}")
+        with self.lock:
+            if key in self.models:
+                self.models.move_to_end(key)
+                self.last_used[key] = time.time()
+                return self.models[key]
+            budget = self.config_manager.get('model_memory_budget_mb')
+            if budget and sum(self.sizes.values()) + self.sizes.get(self.active_key, 0) * workers > budget:
+                return None
+            if key not in self.pools_loading:
+                self.pools_loading.add(key)
+                threading.Thread(target=self._load_pool, args=(key, backend_name, name, workers), daemon=True).start()
+        return None
+    
+    def _load_pool(self, key, backend_name, name, workers):
+        self.message_queue.put(("log", f"Starting {workers} long-form workers for '{name}'..."))
+        threads = max(1, (os.cpu_count() or 2) // workers)
+        pool = ServerPool(backend_name, name, workers, threads,
+                          retries=self.config_manager.get('inference_retries'),
+                          timeout_s=self.config_manager.get('inference_timeout_s'))
+        try:
+            self.warm_up(pool.load())
+        except Exception as e:
+            pool.close()
+            self.pools_loading.discard(key)
+            self.message_queue.put(("error", f"Failed to start long-form workers: {e}"))
+            return
+        with self.lock:
+            self.models[key] = pool
+            self.sizes[key] = pool.memory_mb()
+            self.last_used[key] = time.time()
+            self.pools_loading.discard(key)
+            # No keep: if the budget is still exceeded once older models are gone, the pool goes too
+            self._evict()
+        self.message_queue.put(("log", f"Long-form workers for '{name}' ready"))
+    
+    def activate(self, name, backend_name=None):
+        """Switch the active model; jobs already running keep the model they started with"""
+        backend_name = backend_name or self.config_manager.get('backend')
+        key = (backend_name, name)
+        while True:
+            model = self.get(name, backend_name)
+            with self.lock:
+                # Another load may have evicted it between get() and here; then load it again
+                if self.models.get(key) is not model:
+                    continue
+                self.active_model = model
+                self.active_key = key
+                self.active_name = name
+                # get() couldn't evict the previously active model; now it is just another cache entry
+                self._evict(keep=key)
+                break
+        self.message_queue.put(("status", f"Model '{name}' ({backend_name}) active"))
+        self._start_idle_monitor()
+        return model
+    
+    def touch(self):
+        """Record that the active model was just used"""
+        if self.active_key:
+            self.last_used[self.active_key] = time.time()
+    
+    def warm_up(self, model):
+        """Run a short inference so the first real utterance doesn't pay one-time setup costs"""
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            silence = np.zeros(WHISPER_SAMPLE_RATE, dtype=np.float32)
+            if isinstance(model, ServerPool):
+                clips = len(model.servers)
+                model.transcribe_batch([silence] * clips, ['en'] * clips, condition_on_previous_text=False)
+            else:
+                model.transcribe(silence, language='en', condition_on_previous_text=False)
+    
+    def _evict(self, keep=None):
+        """Drop least recently used models beyond the count or memory budget"""
+        max_models = max(1, self.config_manager.get('model_cache_size'))
+        budget = self.config_manager.get('model_memory_budget_mb')
+        
+        for key in list(self.models):
+            over_count = len(self.models) > max_models
+            over_budget = budget and sum(self.sizes.values()) > budget
+            if not (over_count or over_budget):
+                break
+            if key in (keep, self.active_key):
+                continue
+            self.unload(key)
+    
+    def unload(self, key):
+        """Remove a (backend, model) entry from the cache and free its memory"""
+        with self.lock:
+            if key not in self.models or key == self.active_key:
+                return False
+            self.models.pop(key).close()
+            self.sizes.pop(key, None)
+            self.last_used.pop(key, None)
+        gc.collect()
+        self.message_queue.put(("log", f"Unloaded {key[0]} model '{key[1]}'"))
+        return True
+    
+    def close(self):
+        """Release every cached model, including the active one"""
+        with self.lock:
+            for model in self.models.values():
+                model.close()
+            self.models.clear()
+            self.active_model = None
+            self.active_key = None
+    
+    def loaded_models(self):
+        """(backend, model) keys of the cached models, least recently used first"""
+        return list(self.models)
+    
+    def _start_idle_monitor(self):
+        if self.idle_thread or not self.config_manager.get('model_idle_unload_s'):
+            return
+        self.idle_thread = threading.Thread(target=self._idle_monitor, daemon=True)
+        self.idle_thread.start()
+    
+    def _idle_monitor(self):
+        while True:
+            timeout = self.config_manager.get('model_idle_unload_s')
+            time.sleep(max(5, min(timeout, 60)))
+            now = time.time()
+            for key, used in list(self.last_used.items()):
+                if key != self.active_key and now - used > timeout:
+                    self.unload(key)
\ No newline at end of file
@@ -1,50 +1,162 @@
-import win32gui
-import pyperclip
-import keyboard
+import queue
+import threading
 import time
+from collections import deque
+from chat_backends import create_chat_backend
+from tracing import tracer
+
+class AdaptiveDelay:
+    """Keystroke delay that backs off after failures and settles back to its baseline after clean sends.
+    
+    Keeping focus says nothing about whether the game accepted the paste, so clean sends
+    never push the delay below the configured baseline.
+    """
+    
+    def __init__(self, initial, minimum, maximum):
+        self.value = initial
+        self.floor = max(initial, minimum)
+        self.maximum = maximum
+    
+    def success(self):
+        self.value = max(self.floor, self.value * 0.9)
+    
+    def failure(self):
+        self.value = min(self.maximum, self.value * 2)
 
 class RobloxInterface:
-    def __init__(self, config_manager, message_queue):
+    def __init__(self, config_manager, message_queue, backend=None):
         self.config_manager = config_manager
         self.message_queue = message_queue
+        self.backend = backend or create_chat_backend(config_manager.get('chat_backend'))
+        self.delay = AdaptiveDelay(
+            config_manager.get('chat_key_delay_ms') / 1000.0,
+            config_manager.get('chat_min_key_delay_ms') / 1000.0,
+            config_manager.get('chat_max_key_delay_ms') / 1000.0
+        )
+        self.send_queue = queue.Queue()
+        self.sent_times = deque()
+        self.focus_cache = (0.0, False)
+        self.worker = None
+        self.worker_lock = threading.Lock()
     
     def is_roblox_focused(self):
-        """Check if Roblox window is currently focused"""
+        """Check if Roblox window is currently focused (cached briefly during bursts)"""
+        checked_at, focused = self.focus_cache
+        now = time.monotonic()
+        if now - checked_at < self.config_manager.get('focus_cache_ms') / 1000.0:
+            return focused
         try:
-            window = win32gui.GetForegroundWindow()
-            title = win32gui.GetWindowText(window)
-            return self.config_manager.get('roblox_window_title') in title
+            focused = self.config_manager.get('roblox_window_title') in self.backend.focused_window_title()
         except Exception:
-            return False
+            focused = False
+        self.focus_cache = (now, focused)
+        return focused
+    
+    def send_message(self, text, trace_id=None):
+        """Queue a message for the send worker; returns immediately"""
+        self._ensure_worker()
+        self.send_queue.put((text, trace_id))
+        return True
+    
+    def _ensure_worker(self):
+        with self.worker_lock:
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._run, daemon=True)
+                self.worker.start()
     
-    def send_message(self, text):
-        """Send message to Roblox or copy to clipboard"""
+    def _run(self):
+        while True:
+            item = self.send_queue.get()
+            try:
+                if item is None:
+                    break
+                text, trace_id = item
+                with tracer.span(trace_id, 'send'):
+                    self.deliver(text)
+            finally:
+                self.send_queue.task_done()
+    
+    def deliver(self, text):
+        """Send a message to Roblox chat, split into chat-sized parts, or copy it to the clipboard"""
         try:
             if not self.is_roblox_focused():
                 self.message_queue.put(("log", "Roblox not focused. Message copied to clipboard."))
-                pyperclip.copy(text)
+                self.backend.copy_to_clipboard(text)
                 return False
             
-            pyperclip.copy(text)
-            keyboard.press_and_release('/')
-            time.sleep(0.1)
-            keyboard.press_and_release('ctrl+v')
-            time.sleep(0.1)
-            keyboard.press_and_release('enter')
+            parts = self.split_message(text, self.config_manager.get('chat_max_length'))
+            for index, part in enumerate(parts):
+                self._wait_for_rate_limit()
+                if not self._send_part(part):
+                    self.delay.failure()
+                    self.message_queue.put(("log", "Roblox lost focus while sending. Unsent text copied to clipboard."))
+                    self.backend.copy_to_clipboard(" ".join(parts[index:]))
+                    return False
+                self.delay.success()
             
             self.message_queue.put(("log", "Message sent to Roblox"))
             return True
-            
+        
         except Exception as e:
+            self.delay.failure()
             self.message_queue.put(("error", f"Failed to send to Roblox: {e}"))
-            pyperclip.copy(text)
+            self.backend.copy_to_clipboard(text)
             self.message_queue.put(("log", "Message copied to clipboard instead"))
             return False
     
+    def _send_part(self, part):
+        self.backend.copy_to_clipboard(part)
+        self.backend.open_chat()
+        time.sleep(self.delay.value)
+        self.backend.paste()
+        time.sleep(self.delay.value)
+        
+        self.focus_cache = (0.0, False)
+        if not self.is_roblox_focused():
+            return False
+        self.backend.submit()
+        self.sent_times.append(time.monotonic())
+        return True
+    
+    def _wait_for_rate_limit(self):
+        """Block until another message fits in the chat rate window"""
+        limit = self.config_manager.get('chat_rate_limit')
+        window = self.config_manager.get('chat_rate_window_s')
+        while True:
+            now = time.monotonic()
+            while self.sent_times and now - self.sent_times[0] >= window:
+                self.sent_times.popleft()
+            if not limit or len(self.sent_times) < limit:
+                return
+            time.sleep(window - (now - self.sent_times[0]))
+    
+    @staticmethod
+    def split_message(text, max_length):
+        """Split text into parts no longer than max_length, preferring word boundaries"""
+        text = text.strip()
+        parts = []
+        while len(text) > max_length:
+            cut = text.rfind(' ', 0, max_length + 1)
+            if cut <= 0:
+                cut = max_length
+            parts.append(text[:cut].strip())
+            text = text[cut:].strip()
+        if text:
+            parts.append(text)
+        return parts
+    
+    def wait_until_sent(self):
+        """Block until every queued message has been handled"""
+        self.send_queue.join()
+    
+    def cleanup(self):
+        """Stop the send worker"""
+        if self.worker:
+            self.send_queue.put(None)
+    
     def get_focused_window_title(self):
         """Get the title of the currently focused window"""
         try:
-            window = win32gui.GetForegroundWindow()
-            return win32gui.GetWindowText(window)
+            return self.backend.focused_window_title()
         except Exception:
             return "Unknown"
\ No newline at end of file
@@ -3,7 +3,7 @@ from tkinter import ttk
 import time
 
 class SplashScreen:
-    def __init__(self, root, loading_time=3):
+    def __init__(self, root, required=('ui', 'model'), timeout=120):
         self.root = root
         self.root.overrideredirect(True)
         self.root.attributes('-topmost', True)
@@ -18,17 +18,31 @@ class SplashScreen:
         
         # Add content
         ttk.Label(self.root, text="Voice Transcriber for Roblox", font=('Helvetica', 14, 'bold')).pack(pady=20)
-        ttk.Label(self.root, text="Loading...", font=('Helvetica', 12)).pack()
+        self.status_label = ttk.Label(self.root, text="Loading...", font=('Helvetica', 12))
+        self.status_label.pack()
         
         self.progress = ttk.Progressbar(self.root, mode='indeterminate')
         self.progress.pack(pady=20, padx=40, fill='x')
         self.progress.start()
         
-        self.loading_time = loading_time
+        self.required = set(required)
+        self.ready = set()
+        self.timeout = timeout
         self.start_time = time.time()
-        
+        self.active = True
+    
+    def mark_ready(self, component):
+        """Record that a component finished loading"""
+        self.ready.add(component)
+    
+    def set_status(self, text):
+        """Show what is currently loading"""
+        if self.active:
+            self.status_label.config(text=text)
+    
     def update(self):
-        if time.time() - self.start_time >= self.loading_time:
+        if self.required <= self.ready or time.time() - self.start_time >= self.timeout:
+            self.active = False
             self.root.destroy()
             return False
         return True
\ No newline at end of file
@@ -0,0 +1,49 @@
+import threading
+import time
+from contextlib import contextmanager
+
+class StartupProfiler:
+    """Collects import and initialization timings per component during launch"""
+    
+    def __init__(self):
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self.timings = []
+        self.lock = threading.Lock()
+    
+    def enable(self):
+        self.enabled = True
+    
+    @contextmanager
+    def measure(self, name):
+        """Time the enclosed block under `name` when profiling is enabled"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter())
+    
+    def record(self, name, start, end):
+        with self.lock:
+            self.timings.append((name, start - self.origin, end - start, threading.current_thread().name))
+    
+    def mark(self, name):
+        """Record a zero-length milestone such as a readiness signal"""
+        if self.enabled:
+            now = time.perf_counter()
+            self.record(name, now, now)
+    
+    def report(self):
+        """Print the collected timings ordered by start time"""
+        if not self.enabled:
+            return
+        with self.lock:
+            timings = sorted(self.timings, key=lambda t: t[1])
+        print("Startup profile (start / duration / thread):")
+        for name, start, duration, thread in timings:
+            print(f"  {start * 1000:8.1f} ms  {duration * 1000:8.1f} ms  {thread:<12} {name}")
+
+profiler = StartupProfiler()
\ No newline at end of file
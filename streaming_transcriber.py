@@ -0,0 +1,119 @@
+import threading
+from audio_utils import frames_to_float32, resample, WHISPER_SAMPLE_RATE
+from inference_backends import decoding_options
+
+class StreamingTranscriber:
+    """Transcribes a sliding window of the recording buffer while the user is still speaking.
+    
+    Segments that come out identical in two consecutive passes and end well before the
+    live edge are committed and cut from the window, so the final pass after the hotkey
+    is released only has to decode the unstable tail.
+    """
+    
+    def __init__(self, model, config_manager, message_queue, model_lock):
+        self.model = model
+        self.model_lock = model_lock
+        self.config_manager = config_manager
+        self.message_queue = message_queue
+        self.rate = config_manager.get('rate')
+        self.channels = config_manager.get('channels')
+        self.step = config_manager.get('stream_step_ms') / 1000.0
+        self.window_seconds = config_manager.get('stream_window_s')
+        self.stability_margin = config_manager.get('stream_stability_s')
+        
+        self.frames = []
+        self.frames_lock = threading.Lock()
+        self.committed = []
+        self.committed_samples = 0
+        self.previous_segments = []
+        self.language = None
+        self.language_probability = None
+        self.stop_event = threading.Event()
+        self.thread = None
+    
+    def start(self):
+        """Start the background transcription loop"""
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def add_frames(self, data):
+        """Append a captured chunk to the growing buffer"""
+        with self.frames_lock:
+            self.frames.append(data)
+    
+    def _pending_audio(self):
+        """Return the 16 kHz audio that has not been committed yet"""
+        with self.frames_lock:
+            frames = list(self.frames)
+        if not frames:
+            return None
+        audio = resample(frames_to_float32(frames, self.channels), self.rate, WHISPER_SAMPLE_RATE)
+        return audio[self.committed_samples:]
+    
+    def _transcribe(self, audio):
+        with self.model_lock:
+            if self.language is None:
+                self.language, self.language_probability = self.model.detect_language(
+                    audio, self.config_manager.get('allowed_languages'))
+            return self.model.transcribe(audio, language=self.language, **decoding_options(self.config_manager.get('decoding_preset')))
+    
+    def _run(self):
+        while not self.stop_event.wait(self.step):
+            try:
+                audio = self._pending_audio()
+                if audio is None or len(audio) < WHISPER_SAMPLE_RATE * self.step:
+                    continue
+                
+                result = self._transcribe(audio)
+                self._commit_stable(result.get("segments", []), len(audio) / WHISPER_SAMPLE_RATE)
+                
+                partial = self.committed_text()
+                tail = " ".join(seg["text"].strip() for seg in self.previous_segments)
+                self.message_queue.put(("partial", f"{partial} {tail}".strip()))
+            except Exception as e:
+                self.message_queue.put(("error", f"Streaming transcription error: {e}"))
+                break
+    
+    def _commit_stable(self, segments, window_length):
+        """Commit segments agreed on by two consecutive passes (or forced by the window cap)"""
+        force = window_length > self.window_seconds
+        candidates = segments[:-1] if force else segments
+        stable_end = None
+        count = 0
+        
+        for index, seg in enumerate(candidates):
+            agreed = (
+                index < len(self.previous_segments)
+                and self.previous_segments[index]["text"].strip() == seg["text"].strip()
+            )
+            if not force and (not agreed or seg["end"] > window_length - self.stability_margin):
+                break
+            self.committed.append(seg["text"].strip())
+            stable_end = seg["end"]
+            count = index + 1
+        
+        if stable_end is not None:
+            self.committed_samples += int(stable_end * WHISPER_SAMPLE_RATE)
+        self.previous_segments = segments[count:]
+    
+    def committed_text(self):
+        """Text committed so far"""
+        return " ".join(text for text in self.committed if text)
+    
+    def stop(self):
+        """Stop the background loop without decoding the tail"""
+        self.stop_event.set()
+    
+    def finish(self):
+        """Stop streaming and decode the remaining tail, returning a Whisper-style result"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join()
+        
+        tail_text = ""
+        audio = self._pending_audio()
+        if audio is not None and len(audio) > 0:
+            tail_text = self._transcribe(audio)["text"].strip()
+        
+        text = f"{self.committed_text()} {tail_text}".strip()
+        return {"text": text, "language": self.language or "", "language_probability": self.language_probability}
\ No newline at end of file
@@ -0,0 +1,12 @@
+import sys
+from pathlib import Path
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from config_manager import ConfigManager
+
+@pytest.fixture
+def config_manager(tmp_path, monkeypatch):
+    """A ConfigManager with default settings, reading and writing config.json in a temp directory"""
+    monkeypatch.chdir(tmp_path)
+    return ConfigManager()
@@ -0,0 +1,72 @@
+import queue
+import threading
+import time
+import pytest
+
+pytest.importorskip("numpy")
+from audio_handler import AudioHandler
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+class FakeBackend:
+    name = 'fake'
+    
+    def load(self):
+        return self
+    
+    def transcribe(self, audio, language=None, **options):
+        return {'text': '', 'language': language, 'segments': []}
+    
+    def memory_mb(self):
+        return 0.0
+    
+    def close(self):
+        pass
+
+@pytest.fixture
+def handler(config_manager):
+    handler = AudioHandler(config_manager, queue.Queue())
+    yield handler
+    handler.worker.stop()
+
+def test_jobs_run_after_a_failed_first_load_and_a_model_switch(handler):
+    def fail(backend_name, name):
+        raise RuntimeError("no such model")
+    
+    handler.model_manager.create = fail
+    handler.load_model_async()
+    assert wait_for(lambda: ("component_ready", "model") in list(handler.message_queue.queue))
+    assert handler.model is None
+    
+    handler.model_manager.create = lambda backend_name, name: FakeBackend()
+    handler.switch_model_async('small')
+    assert wait_for(lambda: handler.model is not None)
+    
+    ran = threading.Event()
+    handler.worker.submit(lambda job=None: ran.set())
+    assert ran.wait(2.0)
+
+class FinishedStream:
+    def __init__(self, text, language, probability):
+        self.result = {'text': text, 'language': language, 'language_probability': probability}
+    
+    def finish(self):
+        return self.result
+
+def processed(handler):
+    return [payload for kind, payload in handler.message_queue.queue if kind == "audio_processed"]
+
+def test_streaming_result_passes_the_language_gate(handler, config_manager):
+    config_manager.update({'language_min_probability': 0.5})
+    handler.process_streaming(FinishedStream("hello", 'en', 0.9), trace_id=None)
+    assert processed(handler) == [("hello", 'en', None)]
+
+def test_streaming_result_below_the_gate_is_rejected(handler, config_manager):
+    config_manager.update({'language_min_probability': 0.5})
+    handler.process_streaming(FinishedStream("bonjour", 'en', 0.2), trace_id=None)
+    assert processed(handler) == []
+    assert any("Unsupported language" in str(payload) for _, payload in handler.message_queue.queue)
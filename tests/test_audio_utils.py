@@ -0,0 +1,23 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+from audio_utils import resample
+
+def tone(frequency, rate, seconds=1.0):
+    t = np.arange(int(rate * seconds)) / rate
+    return np.sin(2 * np.pi * frequency * t).astype(np.float32)
+
+def rms(audio):
+    return float(np.sqrt(np.mean(audio ** 2)))
+
+@pytest.mark.parametrize('rate', [22050, 24000, 44100, 48000])
+def test_resample_keeps_speech_band(rate):
+    out = resample(tone(1000, rate), rate)
+    assert len(out) == 16000
+    assert rms(out) > 0.6
+
+@pytest.mark.parametrize('rate', [22050, 24000, 44100, 48000])
+def test_resample_filters_above_target_nyquist(rate):
+    # A 10 kHz tone would alias to 6 kHz at 16 kHz if it were not filtered out first
+    out = resample(tone(10000, rate), rate)
+    assert rms(out) < 0.1
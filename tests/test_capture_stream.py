@@ -0,0 +1,132 @@
+import queue
+import sys
+import threading
+import types
+import pytest
+
+np = pytest.importorskip("numpy")
+from audio_handler import AudioHandler
+from capture_stream import PA_INPUT_OVERFLOW, CaptureStream
+
+CHUNK = 160
+
+def make_capture(chunks=4, channels=1):
+    return CaptureStream(None, 0, 16000, channels, CHUNK, chunks * CHUNK / 16000, queue.Queue())
+
+def pcm(start, count, channels=1):
+    """Samples numbered by their absolute position, so reads can be checked exactly"""
+    return np.repeat(np.arange(start, start + count, dtype=np.int16), channels).tobytes()
+
+def test_callback_wraps_around_the_ring():
+    capture = make_capture()
+    capture._callback(pcm(0, 3 * CHUNK), 3 * CHUNK, None, 0)
+    capture._callback(pcm(3 * CHUNK, 2 * CHUNK), 2 * CHUNK, None, 0)
+    assert capture.position == 5 * CHUNK
+    assert capture.oldest == 2 * CHUNK
+    wrapped = capture.view(3 * CHUNK, 5 * CHUNK)
+    assert wrapped[:, 0].tolist() == list(range(3 * CHUNK, 5 * CHUNK))
+
+def test_callback_counts_overflows_and_keeps_channels():
+    capture = make_capture(channels=2)
+    capture._callback(pcm(0, CHUNK, channels=2), CHUNK, None, PA_INPUT_OVERFLOW)
+    assert capture.stats()['overflows'] == 1
+    assert capture.view(0, CHUNK).shape == (CHUNK, 2)
+
+class ScriptedCapture(CaptureStream):
+    """Delivers `burst` chunks whenever the reader waits, and ends the recording once it has read `total` chunks"""
+    
+    def __init__(self, handler, burst, total, chunks=4):
+        super().__init__(None, 0, 16000, 1, CHUNK, chunks * CHUNK / 16000, queue.Queue())
+        self.handler = handler
+        self.burst = burst
+        self.total = total * CHUNK
+        self.running = True
+    
+    def wait(self, position, timeout=0.5):
+        while self.position < position and self.position < self.total:
+            count = min(self.burst * CHUNK, self.total - self.position)
+            self._callback(pcm(self.position, count), count, None, 0)
+        if position >= self.total:
+            self.handler.is_recording = False
+        return self.position
+
+@pytest.fixture
+def handler(config_manager):
+    config_manager.update({'chunk': CHUNK, 'rate': 16000, 'channels': 1, 'vad_mode': 'off',
+                           'preroll_ms': 0, 'max_recording_s': 0})
+    handler = AudioHandler(config_manager, queue.Queue())
+    yield handler
+    handler.worker.stop()
+
+def errors(handler):
+    return [content for kind, content in list(handler.message_queue.queue) if kind == "error"]
+
+def test_record_audio_reads_every_frame_when_keeping_up(handler):
+    capture = ScriptedCapture(handler, burst=1, total=10)
+    audio, = handler.record_audio(capture)
+    assert audio[:, 0].tolist() == list(range(10 * CHUNK))
+    assert errors(handler) == []
+
+def test_record_audio_survives_ring_wraparound(handler):
+    capture = ScriptedCapture(handler, burst=2, total=12)
+    audio, = handler.record_audio(capture)
+    assert audio[:, 0].tolist() == list(range(12 * CHUNK))
+
+def test_record_audio_drops_lapped_chunks_and_reports_it(handler):
+    capture = ScriptedCapture(handler, burst=6, total=12)
+    audio, = handler.record_audio(capture)
+    samples = audio[:, 0].tolist()
+    # Every chunk kept is intact and in order; the lapped ones are gone, not overwritten garbage
+    assert samples == sorted(samples)
+    assert all(chunk == list(range(chunk[0], chunk[0] + CHUNK)) for chunk in
+               (samples[i:i + CHUNK] for i in range(0, len(samples), CHUNK)))
+    assert len(samples) < 12 * CHUNK
+    assert any("fell behind" in message for message in errors(handler))
+
+def test_record_audio_stops_at_the_maximum_length(handler, config_manager):
+    config_manager.update({'max_recording_s': 0.05})
+    capture = ScriptedCapture(handler, burst=1, total=100, chunks=64)
+    audio, = handler.record_audio(capture)
+    assert len(audio) == 5 * CHUNK
+    assert ("recording_stopped", None) in list(handler.message_queue.queue)
+
+class FakeStream:
+    def __init__(self):
+        self.closed = False
+    
+    def start_stream(self):
+        pass
+    
+    def stop_stream(self):
+        pass
+    
+    def close(self):
+        self.closed = True
+
+class SlowReopenPyAudio:
+    """First open succeeds at once; reopening blocks until `gate` is set"""
+    
+    def __init__(self):
+        self.gate = threading.Event()
+        self.reopening = threading.Event()
+        self.streams = []
+    
+    def open(self, **kwargs):
+        if self.streams:
+            self.reopening.set()
+            self.gate.wait(5.0)
+        self.streams.append(FakeStream())
+        return self.streams[-1]
+
+def test_close_during_a_reopen_does_not_leak_the_device(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'pyaudio', types.SimpleNamespace(paInt16=8))
+    p = SlowReopenPyAudio()
+    capture = CaptureStream(p, 0, 16000, 1, CHUNK, 0.04, queue.Queue(), stall_ms=40)
+    capture.start()
+    assert p.reopening.wait(2.0)
+    capture.close()
+    p.gate.set()
+    capture.monitor.join(2.0)
+    assert not capture.monitor.is_alive()
+    assert [stream.closed for stream in p.streams] == [True, True]
+    assert capture.stream is None
@@ -0,0 +1,41 @@
+import pytest
+from command_grammar import CommandGrammar, VoiceCommand
+
+@pytest.fixture
+def grammar():
+    return CommandGrammar([
+        VoiceCommand('start translation', 'start_translation', anywhere=True),
+        VoiceCommand('stop translation', 'stop_translation', anywhere=True),
+        VoiceCommand('switch to small model', 'switch_model', 'small')
+    ])
+
+@pytest.mark.parametrize('text, action', [
+    ("start translation", 'start_translation'),
+    ("Stop translation.", 'stop_translation'),
+    ("start translations", 'start_translation'),
+    ("stat translation", 'start_translation'),
+    ("ok start translation now", 'start_translation'),
+    ("switch to small model", 'switch_model'),
+])
+def test_matches(grammar, text, action):
+    match = grammar.match(text)
+    assert match is not None
+    assert match.command.action == action
+
+@pytest.mark.parametrize('text', [
+    "I will start translating for you",
+    "stop translating my messages pls",
+    "can you start transaction",
+    "start transaction",
+    "please switch to small model",
+    "ok start translations now",
+    "hello everyone",
+    "",
+])
+def test_ordinary_chat_does_not_match(grammar, text):
+    assert grammar.match(text) is None
+
+def test_candidate_cache_is_bounded(grammar):
+    for index in range(CommandGrammar.CACHE_SIZE * 2):
+        grammar.match(f"chatword{index}")
+    assert len(grammar.candidate_cache) <= CommandGrammar.CACHE_SIZE
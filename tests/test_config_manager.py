@@ -0,0 +1,62 @@
+import json
+import os
+import pytest
+from config_manager import ConfigManager, ConfigSnapshot
+
+def test_snapshot_is_read_only():
+    snapshot = ConfigSnapshot({'rate': 16000})
+    assert snapshot.rate == 16000 and snapshot['rate'] == 16000 and 'rate' in snapshot
+    with pytest.raises(AttributeError):
+        snapshot.rate = 48000
+    with pytest.raises(AttributeError):
+        snapshot.missing
+
+def test_update_replaces_the_snapshot_and_notifies(config_manager):
+    before = config_manager.snapshot
+    seen = []
+    config_manager.subscribe(['rate'], lambda snapshot, changed: seen.append((snapshot.rate, changed)))
+    config_manager.update({'rate': 16000, 'chunk': 1024})
+    config_manager.update({'rate': 16000})
+    assert before.rate == 48000
+    assert seen == [(16000, {'rate'})]
+
+def test_save_config_is_atomic_and_round_trips(config_manager, tmp_path):
+    config_manager.set('model_name', 'small')
+    assert config_manager.save_config()
+    assert sorted(os.listdir(tmp_path)) == ['config.json']
+    assert ConfigManager().get('model_name') == 'small'
+
+def test_failed_save_keeps_the_old_file(config_manager, tmp_path):
+    config_manager.save_config()
+    config_manager.set('voice_commands', [object()])
+    assert not config_manager.save_config()
+    assert sorted(os.listdir(tmp_path)) == ['config.json']
+    assert json.loads((tmp_path / 'config.json').read_text())['voice_commands'] == []
+
+@pytest.mark.parametrize('key, value, kept', [
+    ('rate', 16000, True),
+    ('rate', "16000", False),
+    ('rate', True, False),
+    ('stream_stability_s', 2, True),
+    ('stream_stability_s', False, False),
+    ('streaming_mode', True, True),
+    ('streaming_mode', 1, False),
+    ('mic_name', "USB Mic", True),
+    ('unknown_key', 5, True),
+])
+def test_typed_filters_mismatched_values(config_manager, key, value, kept):
+    assert (key in config_manager._typed({key: value})) == kept
+
+def test_bad_values_in_the_file_are_ignored_at_startup(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'config.json').write_text(json.dumps({'rate': "fast", 'chunk': True, 'model_name': 'tiny'}))
+    config_manager = ConfigManager()
+    assert config_manager.get('rate') == 48000
+    assert config_manager.get('chunk') == 4096
+    assert config_manager.get('model_name') == 'tiny'
+
+def test_reload_applies_valid_edits(config_manager, tmp_path):
+    (tmp_path / 'config.json').write_text(json.dumps({'model_name': 'small', 'rate': "bad"}))
+    config_manager.reload()
+    assert config_manager.get('model_name') == 'small'
+    assert config_manager.get('rate') == 48000
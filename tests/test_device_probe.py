@@ -0,0 +1,22 @@
+import pytest
+from device_probe import DeviceProbe
+
+DEVICE = {'index': 0, 'name': 'Mic', 'host_api': 'MME', 'default_rate': 44100, 'max_channels': 2}
+
+def negotiate(rates, channels=(1, 2)):
+    probe = DeviceProbe(None)
+    probe.capability_cache[probe.device_key(DEVICE)] = {'rates': list(rates), 'channels': list(channels)}
+    return probe.negotiate(DEVICE, 44100)
+
+@pytest.mark.parametrize('rates, expected', [
+    ([48000, 44100, 16000], 16000),
+    ([48000, 44100, 22050], 48000),
+    ([44100, 22050], 44100),
+    ([24000, 22050], 24000),
+    ([8000], 8000),
+])
+def test_negotiate_rate(rates, expected):
+    assert negotiate(rates) == (expected, 1)
+
+def test_negotiate_falls_back_to_stereo():
+    assert negotiate([48000], channels=[2]) == (48000, 2)
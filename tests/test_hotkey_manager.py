@@ -0,0 +1,66 @@
+import queue
+from types import SimpleNamespace
+import pytest
+from hotkey_manager import Binding, HotkeyManager
+
+def key(name, event_type):
+    return SimpleNamespace(name=name, event_type=event_type)
+
+@pytest.fixture
+def hotkeys(config_manager):
+    config_manager.update({'hotkey': 'f2', 'hotkey_bindings': [
+        {'keys': 'ctrl+f2', 'action': 'cancel_pending'},
+        {'keys': 'Left Ctrl + Shift + T', 'action': 'toggle_translation'},
+    ]})
+    return HotkeyManager(config_manager, queue.Queue())
+
+def posted(hotkeys):
+    return [content for kind, content in list(hotkeys.message_queue.queue) if kind == "hotkey"]
+
+def test_compile_bindings_normalizes_and_orders_chords(hotkeys):
+    table = hotkeys.bindings
+    assert table['f2'] == [Binding(frozenset({'ctrl'}), 'cancel_pending', False),
+                           Binding(frozenset(), 'recording_toggle', False)]
+    assert table['t'] == [Binding(frozenset({'ctrl', 'shift'}), 'toggle_translation', False)]
+
+def test_compile_bindings_skips_empty_keys():
+    table = HotkeyManager.compile_bindings({'hotkey': '', 'hotkey_bindings': [{'keys': ' + ', 'action': 'x'}]})
+    assert table == {}
+
+def test_hold_mode_binds_push_to_talk(config_manager):
+    config_manager.update({'hotkey_mode': 'hold'})
+    hotkeys = HotkeyManager(config_manager, queue.Queue())
+    assert hotkeys.bindings['f2'] == [Binding(frozenset(), 'push_to_talk', True)]
+
+def test_config_change_recompiles_the_table(hotkeys, config_manager):
+    config_manager.set('hotkey', 'f4')
+    assert hotkeys.bindings['f4'] == [Binding(frozenset(), 'recording_toggle', False)]
+    assert [binding.action for binding in hotkeys.bindings['f2']] == ['cancel_pending']
+
+def test_auto_repeat_fires_once(hotkeys):
+    for _ in range(3):
+        hotkeys._on_key_event(key('f2', 'down'))
+    hotkeys._on_key_event(key('f2', 'up'))
+    hotkeys._on_key_event(key('f2', 'down'))
+    assert posted(hotkeys) == [('recording_toggle', True), ('recording_toggle', True)]
+
+def test_chord_wins_over_the_bare_key(hotkeys):
+    hotkeys._on_key_event(key('right ctrl', 'down'))
+    hotkeys._on_key_event(key('f2', 'down'))
+    assert posted(hotkeys) == [('cancel_pending', True)]
+
+def test_push_to_talk_posts_press_and_release(config_manager):
+    config_manager.update({'hotkey_mode': 'hold'})
+    hotkeys = HotkeyManager(config_manager, queue.Queue())
+    hotkeys._on_key_event(key('f2', 'down'))
+    hotkeys._on_key_event(key('f2', 'down'))
+    hotkeys._on_key_event(key('f2', 'up'))
+    assert posted(hotkeys) == [('push_to_talk', True), ('push_to_talk', False)]
+
+def test_dispatch_runs_press_and_release_callbacks(hotkeys):
+    calls = []
+    hotkeys.register_hotkey('push_to_talk', lambda: calls.append('down'), on_release=lambda: calls.append('up'))
+    hotkeys.dispatch(('push_to_talk', True))
+    hotkeys.dispatch(('push_to_talk', False))
+    hotkeys.dispatch(('unknown', True))
+    assert calls == ['down', 'up']
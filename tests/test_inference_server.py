@@ -0,0 +1,25 @@
+import pytest
+
+pytest.importorskip("numpy")
+from inference_server import InferenceServerBackend
+
+class DeadProcess:
+    exitcode = -9
+    
+    def is_alive(self):
+        return True
+
+class BrokenPipe:
+    def send(self, message):
+        raise EOFError()
+
+def test_crash_reports_a_reason_and_exit_code():
+    backend = InferenceServerBackend('whisper', 'tiny', retries=0)
+    backend.process, backend.conn = DeadProcess(), BrokenPipe()
+    with pytest.raises(RuntimeError, match=r"Inference server failed: server process exited \(exit code -9\)"):
+        backend.transcribe("clip.wav")
+
+def test_keeps_the_exit_code_already_in_the_message():
+    backend = InferenceServerBackend('whisper', 'tiny')
+    backend.process = DeadProcess()
+    assert backend._failure_reason(EOFError("inference server exited with code -9")) == "inference server exited with code -9"
@@ -0,0 +1,108 @@
+import queue
+import threading
+from inference_worker import InferenceWorker
+
+def make_worker(**options):
+    return InferenceWorker(queue.Queue(), max_queue=8, **options)
+
+def run_again(worker):
+    """Restart the loop as if stop() raced with a running worker, and wait for it to exit"""
+    worker.running = True
+    worker.thread = threading.Thread(target=worker._run, daemon=True)
+    worker.thread.start()
+    worker.thread.join(1.0)
+
+def test_batches_jobs_queued_behind_each_other():
+    worker = make_worker(max_batch=4)
+    batches, single = [], []
+    release = threading.Event()
+    done = threading.Event()
+    
+    def batch_target(jobs):
+        batches.append([job.args[0] for job in jobs])
+        done.set()
+    
+    def target(value, job=None):
+        single.append(value)
+        release.wait(1.0)
+    
+    worker.submit(target, 'first')
+    for value in range(3):
+        worker.submit(target, value, batch_target=batch_target)
+    worker.start()
+    release.set()
+    assert done.wait(1.0)
+    worker.stop()
+    worker.thread.join(1.0)
+    assert single == ['first']
+    assert batches == [[0, 1, 2]]
+
+def test_stop_while_collecting_a_batch():
+    worker = make_worker(max_batch=4, max_wait_ms=200)
+    ran = []
+    worker.submit(lambda value, job=None: ran.append(value), 'only', batch_target=lambda jobs: None)
+    worker.stop()
+    run_again(worker)
+    assert not worker.thread.is_alive()
+    assert ran == ['only']
+
+def test_cancel_pending_keeps_the_stop_request():
+    worker = make_worker()
+    worker.submit(lambda job=None: None)
+    worker.stop()
+    assert worker.cancel_pending() == 1
+    run_again(worker)
+    assert not worker.thread.is_alive()
+
+def test_runs_jobs_in_submission_order():
+    worker = make_worker()
+    ran = []
+    done = threading.Event()
+    for value in range(5):
+        worker.submit(lambda value, job=None: ran.append(value), value)
+    worker.submit(lambda job=None: done.set())
+    worker.start()
+    assert done.wait(1.0)
+    worker.stop()
+    assert ran == [0, 1, 2, 3, 4]
+
+def test_full_queue_drops_the_job():
+    messages = queue.Queue()
+    worker = InferenceWorker(messages, max_queue=2)
+    assert worker.submit(lambda job=None: None)
+    assert worker.submit(lambda job=None: None)
+    assert worker.submit(lambda job=None: None) is None
+    assert ("error", "Transcription queue is full, utterance dropped") in list(messages.queue)
+    assert worker.queue_depth() == 2
+
+def test_cancelled_jobs_are_skipped_and_notified():
+    worker = make_worker()
+    ran, notified = [], []
+    worker.submit(lambda value, job=None: ran.append(value), 'cancelled', on_cancel=lambda: notified.append('cancelled'))
+    assert worker.cancel_pending() == 1
+    assert worker.cancel_pending() == 0
+    done = threading.Event()
+    worker.submit(lambda job=None: done.set())
+    worker.start()
+    assert done.wait(1.0)
+    worker.stop()
+    assert ran == []
+    assert notified == ['cancelled']
+
+def test_cancel_reaches_the_job_in_flight():
+    worker = make_worker()
+    started, release = threading.Event(), threading.Event()
+    notified = []
+    
+    def target(job=None):
+        started.set()
+        release.wait(1.0)
+    
+    job = worker.submit(target, on_cancel=lambda: notified.append(True))
+    worker.start()
+    assert started.wait(1.0)
+    assert worker.cancel_pending() == 1
+    release.set()
+    worker.stop()
+    worker.thread.join(1.0)
+    assert job.cancelled and notified == [True]
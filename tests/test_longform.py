@@ -0,0 +1,68 @@
+import queue
+import pytest
+
+np = pytest.importorskip("numpy")
+from longform import LongFormTranscriber, merge_overlap, split_audio
+
+RATE = 16000
+
+def speech(seconds):
+    """A tone with syllable-rate gaps, too short to count as pauses"""
+    t = np.arange(int(seconds * RATE)) / RATE
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None)
+    return (0.3 * np.sin(2 * np.pi * 220 * t) * envelope).astype(np.float32)
+
+def silence(seconds):
+    return np.zeros(int(seconds * RATE), dtype=np.float32)
+
+def test_short_clip_is_one_chunk():
+    audio = speech(10)
+    assert split_audio(audio) == [(0, len(audio), False)]
+
+def test_cuts_in_the_middle_of_a_pause():
+    audio = np.concatenate((speech(20), silence(1), speech(20)))
+    chunks = split_audio(audio, max_chunk_s=28)
+    assert len(chunks) == 2
+    (start, cut, overlaps), (next_start, end, _) = chunks
+    assert (start, end, overlaps) == (0, len(audio), False)
+    assert cut == next_start
+    assert 20 * RATE <= cut <= 21 * RATE
+
+def test_overlaps_when_there_is_no_pause():
+    audio = speech(60)
+    chunks = split_audio(audio, max_chunk_s=28, overlap_s=1.0)
+    assert chunks[0] == (0, 28 * RATE, True)
+    assert chunks[1][0] == 27 * RATE
+    assert chunks[-1][1] == len(audio)
+    assert all(end - start <= 28 * RATE for start, end, _ in chunks)
+
+def test_chunks_cover_the_whole_clip():
+    audio = np.concatenate([np.concatenate((speech(7), silence(0.5))) for _ in range(12)])
+    chunks = split_audio(audio, max_chunk_s=20)
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(audio)
+    for (_, end, overlaps), (start, _, _) in zip(chunks, chunks[1:]):
+        assert start <= end if overlaps else start == end
+
+@pytest.mark.parametrize('left, right, expected', [
+    ("we should meet at the park", "at the park tomorrow", "tomorrow"),
+    ("see you Later,", "later. Bye then", "Bye then"),
+    ("nothing in common", "completely different words", "completely different words"),
+    ("", "first words", "first words"),
+])
+def test_merge_overlap(left, right, expected):
+    assert merge_overlap(left, right, 'en') == expected
+
+def test_merge_overlap_chinese_characters():
+    assert merge_overlap("我们明天见", "明天见面吧", 'zh') == "面吧"
+
+def test_long_form_is_off_by_default(config_manager):
+    assert config_manager.get('longform_mode') is False
+
+def test_logs_once_when_long_form_needs_the_inference_process(config_manager):
+    config_manager.update({'longform_mode': True, 'inference_process': False})
+    messages = queue.Queue()
+    transcriber = LongFormTranscriber(config_manager, None, None, messages)
+    assert not transcriber.applies(silence(40))
+    assert not transcriber.applies(silence(40))
+    assert messages.get_nowait()[0] == "log"
+    assert messages.empty()
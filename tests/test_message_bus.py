@@ -0,0 +1,71 @@
+import threading
+from message_bus import Message, MessageBus
+
+class FakeRoot:
+    def __init__(self, fail=False):
+        self.bindings = {}
+        self.events = []
+        self.fail = fail
+    
+    def bind(self, event, handler):
+        self.bindings[event] = handler
+    
+    def event_generate(self, event, when=None):
+        if self.fail:
+            raise RuntimeError("main thread is not in main loop")
+        self.events.append(event)
+
+def test_drain_returns_messages_in_order():
+    bus = MessageBus()
+    bus.put(("log", "one"))
+    bus.put(("status", "two"))
+    assert bus.drain() == [Message("log", "one"), Message("status", "two")]
+    assert bus.drain() == []
+
+def test_wakes_the_tk_loop_once_per_drain():
+    bus = MessageBus()
+    root = FakeRoot()
+    drained = []
+    bus.attach(root, lambda: drained.extend(bus.drain()))
+    bus.put(("log", "one"))
+    bus.put(("log", "two"))
+    assert root.events == [MessageBus.EVENT]
+    root.bindings[MessageBus.EVENT](None)
+    assert [message.content for message in drained] == ["one", "two"]
+    bus.put(("log", "three"))
+    assert root.events == [MessageBus.EVENT] * 2
+
+def test_failed_wakeup_is_retried_on_the_next_message():
+    bus = MessageBus()
+    root = FakeRoot(fail=True)
+    bus.attach(root, lambda: None)
+    bus.put(("log", "one"))
+    root.fail = False
+    bus.put(("log", "two"))
+    assert root.events == [MessageBus.EVENT]
+
+def test_subscribed_types_skip_the_tk_queue():
+    bus = MessageBus()
+    handled = threading.Event()
+    received = []
+    
+    def handler(content):
+        received.append(content)
+        handled.set()
+    
+    bus.subscribe("audio_processed", handler)
+    bus.put(("audio_processed", "hello"))
+    assert handled.wait(1.0)
+    assert received == ["hello"]
+    assert bus.drain() == []
+
+def test_handler_errors_are_reported_to_the_gui():
+    bus = MessageBus()
+    
+    def handler(content):
+        raise ValueError("boom")
+    
+    bus.subscribe("send", handler)
+    bus.put(("send", None))
+    message = bus.queue.get(timeout=1.0)
+    assert message == Message("error", "send handler failed: boom")
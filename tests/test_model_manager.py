@@ -0,0 +1,94 @@
+import queue
+import threading
+import pytest
+
+pytest.importorskip("numpy")
+from model_manager import ModelManager
+
+class FakeBackend:
+    def __init__(self, backend_name, name, gate=None, fail=False):
+        self.name = backend_name
+        self.model_name = name
+        self.gate = gate
+        self.fail = fail
+        self.closed = False
+    
+    def load(self):
+        if self.gate:
+            self.gate.wait(2.0)
+        if self.fail:
+            raise RuntimeError("load failed")
+        return self
+    
+    def transcribe(self, audio, language=None, **options):
+        return {'text': '', 'language': language, 'segments': []}
+    
+    def memory_mb(self):
+        return 100.0
+    
+    def close(self):
+        self.closed = True
+
+@pytest.fixture
+def manager(config_manager):
+    config_manager.update({'model_cache_size': 2, 'model_idle_unload_s': 0})
+    manager = ModelManager(config_manager, queue.Queue())
+    manager.created = []
+    
+    def create(backend_name, name):
+        backend = FakeBackend(backend_name, name, **manager.options.get(name, {}))
+        manager.created.append(backend)
+        return backend
+    
+    manager.options = {}
+    manager.create = create
+    return manager
+
+def test_evicts_least_recently_used_beyond_cache_size(manager):
+    manager.activate('a')
+    manager.activate('b')
+    manager.activate('c')
+    assert manager.loaded_models() == [('whisper', 'b'), ('whisper', 'c')]
+    assert manager.created[0].closed
+    assert manager.active_key == ('whisper', 'c')
+
+def test_memory_budget_evicts_but_keeps_the_active_model(manager, config_manager):
+    config_manager.update({'model_memory_budget_mb': 150})
+    manager.activate('a')
+    manager.activate('b')
+    assert manager.loaded_models() == [('whisper', 'b')]
+
+def test_cache_lock_is_free_while_a_model_loads(manager):
+    gate = threading.Event()
+    manager.options['slow'] = {'gate': gate}
+    loader = threading.Thread(target=manager.get, args=('slow',))
+    loader.start()
+    while not manager.loading:
+        pass
+    assert manager.lock.acquire(timeout=0.5)
+    manager.lock.release()
+    assert manager.get('fast') is not None
+    gate.set()
+    loader.join(2.0)
+    assert ('whisper', 'slow') in manager.loaded_models()
+
+def test_concurrent_gets_share_one_load(manager):
+    gate = threading.Event()
+    manager.options['a'] = {'gate': gate}
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(manager.get('a'))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    gate.set()
+    for thread in threads:
+        thread.join(2.0)
+    assert len(manager.created) == 1
+    assert len(results) == 3 and all(model is results[0] for model in results)
+
+def test_failed_load_can_be_retried(manager):
+    manager.options['a'] = {'fail': True}
+    with pytest.raises(RuntimeError):
+        manager.get('a')
+    assert not manager.loading
+    manager.options['a'] = {}
+    assert manager.get('a') is manager.created[-1]
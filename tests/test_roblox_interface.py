@@ -0,0 +1,48 @@
+import queue
+from chat_backends import FakeChatBackend
+from roblox_interface import AdaptiveDelay, RobloxInterface
+
+class StubConfig:
+    def __init__(self, **values):
+        self.values = {
+            'roblox_window_title': 'Roblox', 'focus_cache_ms': 0, 'chat_max_length': 10,
+            'chat_rate_limit': 0, 'chat_rate_window_s': 1,
+            'chat_key_delay_ms': 0, 'chat_min_key_delay_ms': 0, 'chat_max_key_delay_ms': 0,
+            **values
+        }
+
+    def get(self, key):
+        return self.values[key]
+
+class FocusLosingBackend(FakeChatBackend):
+    """Loses focus once `sends` parts have been submitted"""
+
+    def __init__(self, sends):
+        super().__init__()
+        self.sends = sends
+
+    def submit(self):
+        super().submit()
+        if len(self.sent) >= self.sends:
+            self.window_title = "Desktop"
+
+def test_delay_never_shrinks_below_baseline():
+    delay = AdaptiveDelay(0.1, 0.03, 0.4)
+    for _ in range(50):
+        delay.success()
+    assert delay.value == 0.1
+
+def test_delay_recovers_after_failure():
+    delay = AdaptiveDelay(0.1, 0.03, 0.4)
+    delay.failure()
+    assert delay.value == 0.2
+    for _ in range(50):
+        delay.success()
+    assert delay.value == 0.1
+
+def test_focus_loss_copies_unsent_remainder():
+    backend = FocusLosingBackend(sends=1)
+    interface = RobloxInterface(StubConfig(), queue.Queue(), backend)
+    assert not interface.deliver("one two three four five six")
+    assert [text for _, text in backend.sent] == ["one two"]
+    assert backend.clipboard == "three four five six"
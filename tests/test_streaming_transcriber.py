@@ -0,0 +1,57 @@
+import queue
+import threading
+import pytest
+
+pytest.importorskip("numpy")
+from streaming_transcriber import StreamingTranscriber
+
+@pytest.fixture
+def streamer(config_manager):
+    config_manager.update({'stream_window_s': 20, 'stream_stability_s': 1.0})
+    return StreamingTranscriber(None, config_manager, queue.Queue(), threading.Lock())
+
+def seg(start, end, text):
+    return {'start': start, 'end': end, 'text': text}
+
+def test_first_pass_commits_nothing(streamer):
+    segments = [seg(0.0, 2.0, " hello there"), seg(2.0, 4.0, " general")]
+    streamer._commit_stable(segments, 6.0)
+    assert streamer.committed == []
+    assert streamer.committed_samples == 0
+    assert streamer.previous_segments == segments
+
+def test_commits_segments_agreed_on_by_two_passes(streamer):
+    streamer._commit_stable([seg(0.0, 2.0, " hello there"), seg(2.0, 4.0, " general")], 6.0)
+    streamer._commit_stable([seg(0.0, 2.0, "hello there "), seg(2.0, 5.5, " general kenobi")], 6.5)
+    assert streamer.committed_text() == "hello there"
+    assert streamer.committed_samples == 2 * 16000
+    assert [s['text'] for s in streamer.previous_segments] == [" general kenobi"]
+
+def test_keeps_agreed_segments_near_the_live_edge(streamer):
+    segments = [seg(0.0, 2.0, " hello"), seg(2.0, 5.5, " there")]
+    streamer._commit_stable(segments, 6.0)
+    streamer._commit_stable(segments, 6.0)
+    # " there" agrees but ends within the 1 s stability margin
+    assert streamer.committed == ["hello"]
+    assert [s['text'] for s in streamer.previous_segments] == [" there"]
+
+def test_disagreement_stops_committing(streamer):
+    streamer._commit_stable([seg(0.0, 2.0, " one"), seg(2.0, 3.0, " two")], 8.0)
+    streamer._commit_stable([seg(0.0, 2.0, " won"), seg(2.0, 3.0, " two")], 8.0)
+    assert streamer.committed == []
+    assert len(streamer.previous_segments) == 2
+
+def test_window_cap_forces_all_but_the_last_segment(streamer):
+    segments = [seg(0.0, 8.0, " a"), seg(8.0, 16.0, " b"), seg(16.0, 21.0, " c")]
+    streamer._commit_stable(segments, 21.0)
+    assert streamer.committed == ["a", "b"]
+    assert streamer.committed_samples == 16 * 16000
+    assert streamer.previous_segments == [segments[-1]]
+
+def test_stop_ends_the_loop_without_decoding(config_manager):
+    config_manager.update({'stream_step_ms': 10})
+    streamer = StreamingTranscriber(None, config_manager, queue.Queue(), threading.Lock())
+    streamer.start()
+    streamer.stop()
+    streamer.thread.join(1.0)
+    assert not streamer.thread.is_alive()
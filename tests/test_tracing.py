@@ -0,0 +1,42 @@
+import json
+from tracing import Tracer
+
+class ListLogger:
+    def __init__(self):
+        self.lines = []
+    
+    def info(self, line):
+        self.lines.append(json.loads(line))
+
+def make_tracer():
+    tracer = Tracer()
+    tracer.enabled = True
+    tracer.logger = ListLogger()
+    return tracer
+
+def test_spans_record_stage_timings():
+    tracer = make_tracer()
+    trace_id = tracer.new_trace()
+    with tracer.span(trace_id, 'inference', model='base'):
+        pass
+    entry, = tracer.logger.lines
+    assert (entry['trace'], entry['stage'], entry['model']) == (trace_id, 'inference', 'base')
+    assert entry['ms'] >= 0
+    assert set(tracer.summary()) == {'inference'}
+
+def test_rtf_is_its_own_field_outside_the_stage_stats():
+    tracer = make_tracer()
+    tracer.record_rtf('abc', 10.0, 2.5)
+    entry, = tracer.logger.lines
+    assert entry['rtf'] == 0.25 and entry['audio_s'] == 10.0
+    assert 'stage' not in entry and 'ms' not in entry
+    assert tracer.latest_rtf == 0.25
+    assert tracer.summary() == {}
+    assert 'rtf' not in tracer.stats
+
+def test_untraced_utterances_are_not_recorded():
+    tracer = make_tracer()
+    with tracer.span(None, 'capture'):
+        pass
+    tracer.record_rtf(None, 1.0, 1.0)
+    assert tracer.logger.lines == [] and tracer.latest_rtf is None
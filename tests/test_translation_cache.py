@@ -0,0 +1,56 @@
+import sqlite3
+from translation_cache import TranslationCache
+
+def test_normalized_keys_share_an_entry():
+    cache = TranslationCache()
+    cache.put("Hello  World!", 'en', 'zh', "你好世界")
+    assert cache.get("hello world", 'en', 'zh') == "你好世界"
+    assert cache.get("hello world", 'zh', 'en') is None
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+def test_memory_lru_drops_the_least_recently_used():
+    cache = TranslationCache(max_entries=2)
+    cache.put("a", 'en', 'zh', "A")
+    cache.put("b", 'en', 'zh', "B")
+    cache.get("a", 'en', 'zh')
+    cache.put("c", 'en', 'zh', "C")
+    assert cache.get("b", 'en', 'zh') is None
+    assert cache.get("a", 'en', 'zh') == "A"
+    assert cache.stats()['size'] == 2
+
+def test_persists_across_instances(tmp_path):
+    path = tmp_path / "cache.db"
+    cache = TranslationCache(persist_path=path)
+    cache.put("good morning", 'en', 'zh', "早上好")
+    cache.close()
+    
+    reopened = TranslationCache(max_entries=1, persist_path=path)
+    assert reopened.get("Good morning.", 'en', 'zh') == "早上好"
+    reopened.close()
+
+def test_persistent_store_keeps_the_most_recently_used(tmp_path):
+    path = tmp_path / "cache.db"
+    cache = TranslationCache(max_entries=1, persist_path=path, max_persistent_entries=2)
+    cache.put("old", 'en', 'zh', "1")
+    cache.put("new", 'en', 'zh', "2")
+    assert cache.get("old", 'en', 'zh') == "1"
+    cache.put("newest", 'en', 'zh', "3")
+    cache.close()
+    
+    db = sqlite3.connect(path)
+    keys = {key for key, in db.execute("SELECT key FROM translations")}
+    db.close()
+    assert keys == {"en:zh:old", "en:zh:newest"}
+
+def test_hits_are_written_in_batches(tmp_path):
+    cache = TranslationCache(max_entries=1, persist_path=tmp_path / "cache.db")
+    cache.TOUCH_BATCH = 3
+    for text in "abcd":
+        cache.put(text, 'en', 'zh', text.upper())
+    changes = cache.db.total_changes
+    for text in "aab":
+        assert cache.get(text, 'en', 'zh') == text.upper()
+    assert cache.db.total_changes == changes
+    cache.get("c", 'en', 'zh')
+    assert cache.db.total_changes == changes + 3
+    cache.close()
@@ -0,0 +1,50 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+from vad import Endpointer, EnergyVAD
+
+RATE = 16000
+CHUNK = 1600  # 100 ms
+
+def speech_chunk():
+    t = np.arange(CHUNK) / RATE
+    return (0.3 * np.sin(2 * np.pi * 300 * t) * 32767).astype(np.int16)
+
+def silence_chunk(seed=0):
+    return (np.random.default_rng(seed).normal(0, 0.001, CHUNK) * 32767).astype(np.int16)
+
+def as_float(chunk):
+    return chunk.astype(np.float32) / 32768.0
+
+def test_energy_vad_separates_speech_from_noise():
+    vad = EnergyVAD(RATE)
+    assert not vad.is_speech(as_float(silence_chunk()))
+    assert vad.is_speech(as_float(speech_chunk()))
+    assert not vad.is_speech(as_float(silence_chunk(1)))
+
+def test_energy_vad_ignores_chunks_shorter_than_a_frame():
+    assert not EnergyVAD(RATE).is_speech(np.zeros(10, dtype=np.float32))
+
+@pytest.fixture
+def endpointer(config_manager):
+    config_manager.update({'rate': RATE, 'channels': 1, 'vad_padding_ms': 300, 'vad_auto_stop_ms': 500})
+    return Endpointer(EnergyVAD(RATE), config_manager)
+
+def test_trim_keeps_padding_around_speech(endpointer):
+    frames = [silence_chunk(i) for i in range(5)] + [speech_chunk()] * 3 + [silence_chunk(i) for i in range(5, 9)]
+    for chunk in frames:
+        endpointer.process(chunk)
+    assert (endpointer.first_speech, endpointer.last_speech) == (5, 7)
+    assert endpointer.trim(frames) == frames[2:11]
+
+def test_auto_stop_after_trailing_silence(endpointer):
+    stops = [endpointer.process(chunk) for chunk in [silence_chunk()] + [speech_chunk()] * 2]
+    stops += [endpointer.process(silence_chunk(i)) for i in range(5)]
+    assert stops == [False] * 7 + [True]
+
+def test_no_speech_trims_everything(endpointer):
+    frames = [silence_chunk(i) for i in range(4)]
+    for chunk in frames:
+        assert not endpointer.process(chunk)
+    assert not endpointer.speech_detected
+    assert endpointer.trim(frames) == []
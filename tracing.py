@@ -0,0 +1,108 @@
+import json
+import logging
+import logging.handlers
+import threading
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+
+class _NullSpan:
+    """Shared no-op span used when tracing is off"""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+NULL_SPAN = _NullSpan()
+
+class _Span:
+    def __init__(self, tracer, trace_id, stage, attrs):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.stage = stage
+        self.attrs = attrs
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        self.tracer.record(self.trace_id, self.stage, time.perf_counter() - self.start, self.attrs)
+        return False
+
+class Tracer:
+    """Per-utterance timed spans, exported to a rotating JSONL file and rolling averages"""
+    
+    def __init__(self):
+        self.enabled = False
+        self.logger = None
+        self.stats = {}
+        self.window = 50
+        self.latest_rtf = None
+        self.lock = threading.Lock()
+    
+    def configure(self, config_manager):
+        """Enable tracing according to config"""
+        self.enabled = bool(config_manager.get('tracing_enabled'))
+        self.window = config_manager.get('trace_stats_window')
+        if not self.enabled or self.logger:
+            return
+        
+        path = Path(config_manager.get('trace_file'))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            path,
+            maxBytes=config_manager.get('trace_max_bytes'),
+            backupCount=config_manager.get('trace_backups'),
+            encoding='utf-8'
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self.logger = logging.getLogger('voice_transcriber.trace')
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.logger.addHandler(handler)
+    
+    def new_trace(self):
+        """Start a trace for one utterance; returns None when tracing is off"""
+        if not self.enabled:
+            return None
+        return uuid.uuid4().hex[:12]
+    
+    def span(self, trace_id, stage, **attrs):
+        """Context manager timing `stage` for the given trace"""
+        if trace_id is None:
+            return NULL_SPAN
+        return _Span(self, trace_id, stage, attrs)
+    
+    def record(self, trace_id, stage, duration, attrs=None):
+        with self.lock:
+            self.stats.setdefault(stage, deque(maxlen=self.window)).append(duration)
+        entry = {'trace': trace_id, 'stage': stage, 'ts': time.time(), 'ms': round(duration * 1000, 3)}
+        if attrs:
+            entry.update(attrs)
+        self._write(entry)
+    
+    def record_rtf(self, trace_id, audio_seconds, inference_seconds):
+        """Record the real-time factor of an inference as its own `rtf` field, outside the stage timings"""
+        if trace_id is None or not audio_seconds:
+            return
+        self.latest_rtf = inference_seconds / audio_seconds
+        self._write({'trace': trace_id, 'ts': time.time(), 'rtf': round(self.latest_rtf, 4), 'audio_s': round(audio_seconds, 3)})
+    
+    def _write(self, entry):
+        if self.logger:
+            self.logger.info(json.dumps(entry, ensure_ascii=False))
+    
+    def summary(self):
+        """Rolling average milliseconds per stage"""
+        with self.lock:
+            return {
+                stage: sum(values) * 1000 / len(values)
+                for stage, values in self.stats.items()
+                if values
+            }
+
+tracer = Tracer()
\ No newline at end of file
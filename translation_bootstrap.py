@@ -0,0 +1,157 @@
+import hashlib
+import json
+import shutil
+import zipfile
+from pathlib import Path
+import argostranslate.package
+
+class TranslationBootstrap:
+    """Installs the configured translation pairs, preferring what is already installed or cached locally"""
+    
+    PACKAGE_SUFFIX = ".argosmodel"
+    
+    def __init__(self, config_manager, message_queue):
+        self.config_manager = config_manager
+        self.message_queue = message_queue
+        self.package_dir = Path(config_manager.get('translation_package_dir'))
+    
+    def required_pairs(self):
+        """Language pairs declared in config as (from_code, to_code) tuples"""
+        return [tuple(pair) for pair in self.config_manager.get('translation_pairs')]
+    
+    @staticmethod
+    def installed_pairs():
+        return {(pkg.from_code, pkg.to_code) for pkg in argostranslate.package.get_installed_packages()}
+    
+    def run(self):
+        """Install missing pairs; only touches the network when local sources can't satisfy them"""
+        missing = [pair for pair in self.required_pairs() if pair not in self.installed_pairs()]
+        if not missing:
+            self.message_queue.put(("log", "Translation packages already installed"))
+            return True
+        
+        missing = self.install_local(missing)
+        if missing:
+            missing = self.install_remote(missing)
+        
+        for from_code, to_code in missing:
+            self.message_queue.put(("log", f"Translation package {from_code}->{to_code} not available"))
+        return not missing
+    
+    def local_packages(self):
+        """Map (from_code, to_code) to package files in the local package directory"""
+        packages = {}
+        if not self.package_dir.is_dir():
+            return packages
+        for path in sorted(self.package_dir.glob(f"*{self.PACKAGE_SUFFIX}")):
+            try:
+                packages[self.read_pair(path)] = path
+            except Exception as e:
+                self.message_queue.put(("log", f"Skipping unreadable package {path.name}: {e}"))
+        return packages
+    
+    @staticmethod
+    def read_pair(path):
+        """Read the language pair from a package's metadata.json"""
+        with zipfile.ZipFile(path) as archive:
+            name = next(n for n in archive.namelist() if n.endswith("metadata.json"))
+            metadata = json.loads(archive.read(name))
+        return metadata["from_code"], metadata["to_code"]
+    
+    @staticmethod
+    def sha256(path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def expected_checksum(self, path):
+        """Checksum from config, or from a `<package>.sha256` file next to the package"""
+        checksums = self.config_manager.get('translation_package_checksums') or {}
+        if path.name in checksums:
+            return checksums[path.name].lower()
+        sidecar = path.with_name(path.name + ".sha256")
+        if sidecar.exists():
+            return sidecar.read_text().split()[0].lower()
+        return None
+    
+    def verify(self, path):
+        """Check a package file against its expected checksum"""
+        expected = self.expected_checksum(path)
+        if expected is None:
+            if self.config_manager.get('translation_require_checksum'):
+                self.message_queue.put(("log", f"No checksum for {path.name}, skipping"))
+                return False
+            return True
+        if self.sha256(path) != expected:
+            self.message_queue.put(("error", f"Checksum mismatch for {path.name}"))
+            return False
+        return True
+    
+    def install_local(self, missing):
+        """Install what we can from the local package directory; returns the pairs still missing"""
+        local = self.local_packages()
+        remaining = []
+        for pair in missing:
+            path = local.get(pair)
+            if path and self.verify(path):
+                argostranslate.package.install_from_path(str(path))
+                self.message_queue.put(("log", f"Installed {pair[0]}->{pair[1]} from {path.name}"))
+            else:
+                remaining.append(pair)
+        return remaining
+    
+    def install_remote(self, missing):
+        """Download missing pairs from the package index and keep a verified copy locally"""
+        self.message_queue.put(("status", "Downloading translation packages..."))
+        argostranslate.package.update_package_index()
+        available = {(pkg.from_code, pkg.to_code): pkg for pkg in argostranslate.package.get_available_packages()}
+        
+        remaining = []
+        for pair in missing:
+            pkg = available.get(pair)
+            if pkg is None:
+                remaining.append(pair)
+                continue
+            
+            path = Path(pkg.download())
+            verified = self.verify_download(path, self.cache_name(pair))
+            if verified is False:
+                remaining.append(pair)
+                continue
+            argostranslate.package.install_from_path(str(path))
+            self.cache_package(path, pair, verified)
+            self.message_queue.put(("log", f"Installed {pair[0]}->{pair[1]} from package index"))
+        return remaining
+    
+    def cache_name(self, pair):
+        return f"translate-{pair[0]}_{pair[1]}{self.PACKAGE_SUFFIX}"
+    
+    def verify_download(self, path, cache_name):
+        """True if a download matches its configured checksum, None if there is none to check, False to reject it"""
+        checksums = self.config_manager.get('translation_package_checksums') or {}
+        expected = checksums.get(cache_name) or checksums.get(path.name)
+        if expected is None:
+            if self.config_manager.get('translation_require_checksum'):
+                self.message_queue.put(("log", f"No checksum for downloaded {path.name}, skipping"))
+                return False
+            return None
+        if self.sha256(path) != expected.lower():
+            self.message_queue.put(("error", f"Checksum mismatch for downloaded {path.name}"))
+            return False
+        return True
+    
+    def cache_package(self, path, pair, verified):
+        """Copy a downloaded package into the local package directory, with a checksum file only if it was verified"""
+        try:
+            self.package_dir.mkdir(parents=True, exist_ok=True)
+            target = self.package_dir / self.cache_name(pair)
+            shutil.copyfile(path, target)
+            sidecar = target.with_name(target.name + ".sha256")
+            if verified:
+                sidecar.write_text(f"{self.sha256(target)}  {target.name}\n")
+            elif sidecar.exists():
+                sidecar.unlink()
+        except OSError as e:
+            self.message_queue.put(("log", f"Could not cache translation package: {e}"))
\ No newline at end of file
@@ -0,0 +1,119 @@
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+class TranslationCache:
+    """LRU cache of translations keyed by normalized text, with an optional SQLite store.
+    
+    Last-used times of hits are buffered and written with the next store, on close,
+    or once `TOUCH_BATCH` distinct entries are waiting, so hits rarely wait on a disk commit.
+    """
+    
+    TOUCH_BATCH = 64
+    
+    def __init__(self, max_entries=512, persist_path=None, max_persistent_entries=10000):
+        self.max_entries = max_entries
+        self.max_persistent_entries = max_persistent_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.touched = {}
+        self.db = None
+        if persist_path:
+            self.db = sqlite3.connect(persist_path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS translations "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, used REAL NOT NULL)"
+            )
+            self.db.commit()
+    
+    @staticmethod
+    def normalize(text):
+        """Lowercase, collapse whitespace and drop trailing punctuation"""
+        text = re.sub(r'\s+', ' ', text.strip().lower())
+        return text.rstrip('.!?,;:。！？，')
+    
+    def make_key(self, text, from_code, to_code):
+        return f"{from_code}:{to_code}:{self.normalize(text)}"
+    
+    def get(self, text, from_code, to_code):
+        """Return the cached translation, or None on a miss"""
+        key = self.make_key(text, from_code, to_code)
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                self._touch(key)
+                return self.entries[key]
+            
+            if self.db:
+                row = self.db.execute("SELECT value FROM translations WHERE key = ?", (key,)).fetchone()
+                if row:
+                    self._remember(key, row[0])
+                    self.hits += 1
+                    self._touch(key)
+                    return row[0]
+            
+            self.misses += 1
+            return None
+    
+    def put(self, text, from_code, to_code, translation):
+        """Store a translation in memory and, if enabled, on disk"""
+        key = self.make_key(text, from_code, to_code)
+        with self.lock:
+            self._remember(key, translation)
+            if self.db:
+                self._flush_touched()
+                self.db.execute(
+                    "INSERT OR REPLACE INTO translations (key, value, used) VALUES (?, ?, ?)",
+                    (key, translation, time.time())
+                )
+                self.db.execute(
+                    "DELETE FROM translations WHERE key NOT IN "
+                    "(SELECT key FROM translations ORDER BY used DESC LIMIT ?)",
+                    (self.max_persistent_entries,)
+                )
+                self.db.commit()
+    
+    def _touch(self, key):
+        if not self.db:
+            return
+        self.touched[key] = time.time()
+        if len(self.touched) >= self.TOUCH_BATCH:
+            self._flush_touched()
+            self.db.commit()
+    
+    def _flush_touched(self):
+        """Write buffered last-used times; the caller commits"""
+        if self.touched:
+            self.db.executemany("UPDATE translations SET used = ? WHERE key = ?",
+                                [(used, key) for key, used in self.touched.items()])
+            self.touched.clear()
+    
+    def _remember(self, key, translation):
+        self.entries[key] = translation
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+    
+    def stats(self):
+        """Hit/miss counters and current size"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'size': len(self.entries)
+        }
+    
+    def close(self):
+        """Close the persistent store"""
+        with self.lock:
+            if self.db:
+                self._flush_touched()
+                self.db.commit()
+                self.db.close()
+                self.db = None
\ No newline at end of file
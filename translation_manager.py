@@ -1,72 +1,159 @@
 import threading
-import argostranslate.package
-import argostranslate.translate
-from pycorrector import Corrector
-import re
+from translation_cache import TranslationCache
+from command_grammar import CommandGrammar, VoiceCommand
+from startup_profiler import profiler
 
 class TranslationManager:
     def __init__(self, config_manager, message_queue):
         self.config_manager = config_manager
         self.message_queue = message_queue
-        self.corrector = Corrector()
+        self._corrector = None
+        self.corrector_lock = threading.Lock()
         self.translation_mode = False
+        self.translators = {}
+        self.grammar = None
+        config_manager.subscribe(
+            ('translation_trigger', 'stop_translation', 'voice_commands', 'command_fuzzy_ratio', 'command_max_edits'),
+            self._on_commands_changed
+        )
+        self.cache = TranslationCache(
+            max_entries=config_manager.get('translation_cache_size'),
+            persist_path=config_manager.get('translation_cache_file'),
+            max_persistent_entries=config_manager.get('translation_cache_max_persistent')
+        )
     
     def setup_translation_async(self):
         """Setup translation packages asynchronously"""
         def setup_translation():
             try:
                 self.message_queue.put(("status", "Setting up translation..."))
-                argostranslate.package.update_package_index()
+                with profiler.measure("import argostranslate"):
+                    from translation_bootstrap import TranslationBootstrap
+                with profiler.measure("translation bootstrap"):
+                    complete = TranslationBootstrap(self.config_manager, self.message_queue).run()
+                self.translators.clear()
                 
-                available_packages = argostranslate.package.get_available_packages()
-                for pkg in available_packages:
-                    if pkg.from_code == "en" and pkg.to_code == "zh":
-                        argostranslate.package.install_from_path(pkg.download())
-                        break
+                if self.config_manager.get('enable_chinese_autocorrect'):
+                    self.get_corrector()
                 
-                self.message_queue.put(("log", "Translation setup complete"))
+                self.message_queue.put(("log", "Translation setup complete" if complete else "Translation setup incomplete"))
             except Exception as e:
                 self.message_queue.put(("log", f"Translation setup failed: {e}"))
+            finally:
+                self.message_queue.put(("component_ready", "translation"))
         
         threading.Thread(target=setup_translation, daemon=True).start()
     
+    def get_corrector(self):
+        """pycorrector instance, constructed on first use"""
+        with self.corrector_lock:
+            if self._corrector is None:
+                with profiler.measure("pycorrector init"):
+                    from pycorrector import Corrector
+                    self._corrector = Corrector()
+        return self._corrector
+    
     def correct_transcription(self, text, lang):
         """Apply text correction based on language"""
         if lang == 'zh' and self.config_manager.get('enable_chinese_autocorrect'):
-            result = self.corrector.correct(text)
+            result = self.get_corrector().correct(text)
             return result['target'], result.get('errors', [])
         return text, []
     
+    def get_command_grammar(self):
+        """Compiled voice-command grammar, rebuilt only after the command config changes"""
+        grammar = self.grammar
+        if grammar is None:
+            config = self.config_manager.snapshot
+            commands = [
+                VoiceCommand(config.translation_trigger, 'start_translation', anywhere=True),
+                VoiceCommand(config.stop_translation, 'stop_translation', anywhere=True)
+            ]
+            for entry in config.voice_commands:
+                commands.append(VoiceCommand(
+                    entry['phrase'], entry['action'], entry.get('argument'), entry.get('anywhere', False)
+                ))
+            grammar = self.grammar = CommandGrammar(commands, config.command_fuzzy_ratio, max_cost=config.command_max_edits)
+        return grammar
+    
+    def _on_commands_changed(self, snapshot, changed):
+        """Drop the compiled grammar so the next utterance sees the new phrases"""
+        self.grammar = None
+    
     def check_trigger_phrases(self, text, lang):
-        """Check if text contains translation trigger phrases"""
+        """Check if text is a voice command and run it; returns True if the text was consumed"""
         if lang != 'en':
             return False
         
-        trigger = self.config_manager.get('translation_trigger').lower()
-        stop = self.config_manager.get('stop_translation').lower()
-        
-        if re.search(r'\b' + re.escape(trigger) + r'\b', text.lower()):
+        match = self.get_command_grammar().match(text)
+        if match is None:
+            return False
+        return self.run_command(match.command)
+    
+    def run_command(self, command):
+        """Execute a matched voice command"""
+        if command.action == 'start_translation':
             self.translation_mode = True
-            self.message_queue.put(("log", f"Translation mode activated by phrase: {trigger}"))
+            self.message_queue.put(("log", f"Translation mode activated by phrase: {command.phrase}"))
             self.message_queue.put(("translation_mode_changed", True))
             return True
         
-        if re.search(r'\b' + re.escape(stop) + r'\b', text.lower()) and self.translation_mode:
+        if command.action == 'stop_translation':
+            if not self.translation_mode:
+                return False
             self.translation_mode = False
-            self.message_queue.put(("log", f"Translation mode deactivated by phrase: {stop}"))
+            self.message_queue.put(("log", f"Translation mode deactivated by phrase: {command.phrase}"))
             self.message_queue.put(("translation_mode_changed", False))
             return True
         
+        if command.action == 'toggle_translation':
+            self.toggle_translation_mode()
+            return True
+        
+        if command.action in ('switch_model', 'send_message'):
+            self.message_queue.put(("log", f"Voice command: {command.phrase}"))
+            self.message_queue.put((command.action, command.argument))
+            return True
+        
+        self.message_queue.put(("error", f"Unknown voice command action: {command.action}"))
         return False
     
+    def get_translator(self, from_code, to_code):
+        """Resolve the installed translation object for a language pair once and reuse it"""
+        key = (from_code, to_code)
+        if key not in self.translators:
+            import argostranslate.translate
+            languages = {lang.code: lang for lang in argostranslate.translate.get_installed_languages()}
+            if from_code not in languages or to_code not in languages:
+                raise RuntimeError(f"Translation package {from_code}->{to_code} is not installed")
+            translator = languages[from_code].get_translation(languages[to_code])
+            if translator is None:
+                raise RuntimeError(f"No translation available for {from_code}->{to_code}")
+            self.translators[key] = translator
+        return self.translators[key]
+    
     def translate_to_chinese(self, text):
         """Translate English text to Chinese"""
         try:
-            return argostranslate.translate.translate(text, "en", "zh")
+            cached = self.cache.get(text, "en", "zh")
+            if cached is not None:
+                return cached
+            
+            translated = self.get_translator("en", "zh").translate(text)
+            self.cache.put(text, "en", "zh", translated)
+            return translated
         except Exception as e:
             self.message_queue.put(("error", f"Translation error: {e}"))
             return text
     
+    def cache_stats(self):
+        """Translation cache hit/miss counters"""
+        return self.cache.stats()
+    
+    def cleanup(self):
+        """Cleanup resources"""
+        self.cache.close()
+    
     def toggle_translation_mode(self):
         """Toggle translation mode on/off"""
         self.translation_mode = not self.translation_mode
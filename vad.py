@@ -0,0 +1,119 @@
+import numpy as np
+from audio_utils import frames_to_float32, resample
+
+class EnergyVAD:
+    """Energy and zero-crossing-rate voice activity detector with an adaptive noise floor"""
+    
+    def __init__(self, rate, frame_ms=20, energy_ratio=3.0, min_rms=0.004, max_zcr=0.35):
+        self.frame_size = max(1, int(rate * frame_ms / 1000))
+        self.energy_ratio = energy_ratio
+        self.min_rms = min_rms
+        self.max_zcr = max_zcr
+        self.noise_floor = None
+    
+    def is_speech(self, audio):
+        """Return True if the chunk contains speech"""
+        usable = len(audio) - len(audio) % self.frame_size
+        if usable == 0:
+            return False
+        
+        frames = audio[:usable].reshape(-1, self.frame_size)
+        rms = np.sqrt(np.mean(frames ** 2, axis=1))
+        zcr = np.mean(np.abs(np.diff(np.signbit(frames), axis=1)), axis=1)
+        
+        if self.noise_floor is None:
+            self.noise_floor = float(np.percentile(rms, 20))
+        
+        threshold = max(self.min_rms, self.noise_floor * self.energy_ratio)
+        voiced = (rms > threshold) & (zcr < self.max_zcr)
+        
+        quiet = rms[~voiced]
+        if len(quiet):
+            self.noise_floor = 0.9 * self.noise_floor + 0.1 * float(np.mean(quiet))
+        
+        return np.mean(voiced) >= 0.3
+
+class WebRTCVAD:
+    """GMM-based voice activity detector from the optional webrtcvad package"""
+    
+    SUPPORTED_RATES = (8000, 16000, 32000, 48000)
+    
+    def __init__(self, rate, aggressiveness=2, frame_ms=30):
+        import webrtcvad
+        self.vad = webrtcvad.Vad(aggressiveness)
+        self.source_rate = rate
+        self.rate = rate if rate in self.SUPPORTED_RATES else 16000
+        self.frame_size = int(self.rate * frame_ms / 1000)
+    
+    def is_speech(self, audio):
+        """Return True if most 30 ms frames in the chunk are voiced"""
+        if self.rate != self.source_rate:
+            audio = resample(audio, self.source_rate, self.rate)
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+        
+        usable = len(pcm) - len(pcm) % self.frame_size
+        if usable == 0:
+            return False
+        
+        frames = pcm[:usable].reshape(-1, self.frame_size)
+        voiced = [self.vad.is_speech(frame.tobytes(), self.rate) for frame in frames]
+        return sum(voiced) * 2 >= len(voiced)
+
+def create_vad(config_manager, message_queue=None):
+    """Build the detector selected by `vad_mode`, or None if VAD is off"""
+    mode = config_manager.get('vad_mode')
+    rate = config_manager.get('rate')
+    
+    if mode == 'webrtc':
+        try:
+            return WebRTCVAD(rate, config_manager.get('vad_aggressiveness'))
+        except ImportError:
+            if message_queue:
+                message_queue.put(("log", "webrtcvad not installed, using energy VAD"))
+            return EnergyVAD(rate)
+    if mode == 'energy':
+        return EnergyVAD(rate)
+    return None
+
+class Endpointer:
+    """Tracks speech in each recorded chunk to trim silence and detect end of speech"""
+    
+    def __init__(self, vad, config_manager):
+        self.vad = vad
+        self.channels = config_manager.get('channels')
+        self.rate = config_manager.get('rate')
+        self.padding_ms = config_manager.get('vad_padding_ms')
+        self.auto_stop_ms = config_manager.get('vad_auto_stop_ms')
+        self.chunk_ms = 0.0
+        self.index = -1
+        self.first_speech = None
+        self.last_speech = None
+    
+    def process(self, data):
+        """Classify one chunk; returns True when the auto-stop silence limit is reached"""
+        audio = frames_to_float32([data], self.channels)
+        self.chunk_ms = len(audio) * 1000.0 / self.rate
+        self.index += 1
+        
+        if self.vad.is_speech(audio):
+            if self.first_speech is None:
+                self.first_speech = self.index
+            self.last_speech = self.index
+            return False
+        
+        if not self.auto_stop_ms or self.last_speech is None:
+            return False
+        return (self.index - self.last_speech) * self.chunk_ms >= self.auto_stop_ms
+    
+    @property
+    def speech_detected(self):
+        return self.first_speech is not None
+    
+    def trim(self, frames):
+        """Drop leading and trailing silence, keeping `vad_padding_ms` around the speech"""
+        if not self.speech_detected:
+            return []
+        pad = int(np.ceil(self.padding_ms / self.chunk_ms)) if self.chunk_ms else 0
+        start = max(0, self.first_speech - pad)
+        end = min(len(frames), self.last_speech + pad + 1)
+        return frames[start:end]
\ No newline at end of file